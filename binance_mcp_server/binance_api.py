@@ -1,6 +1,24 @@
 # binance_api.py
+import asyncio
+import functools
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from operator import itemgetter
+from pathlib import Path
+from typing import Optional, Union
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
+from binance_mcp_server import __version__
+
+try:
+    import ijson  # Optional: incremental parsing of the large all-symbols responses
+except ImportError:
+    ijson = None
 
 BASE_URL = "https://api.binance.com"  # Base endpoint for Binance Spot API
 
@@ -8,16 +26,236 @@ BASE_URL = "https://api.binance.com"  # Base endpoint for Binance Spot API
 API_KEY = os.getenv("BINANCE_API_KEY")     # Public API key (for future private endpoints)
 API_SECRET = os.getenv("BINANCE_API_SECRET")  # API secret (for future use)
 
+# Endpoint URLs, built once at import instead of formatted on every call
+_PING_URL = BASE_URL + "/api/v3/ping"
+_TIME_URL = BASE_URL + "/api/v3/time"
+_PRICE_URL = BASE_URL + "/api/v3/ticker/price"
+_DEPTH_URL = BASE_URL + "/api/v3/depth"
+_KLINES_URL = BASE_URL + "/api/v3/klines"
+_UI_KLINES_URL = BASE_URL + "/api/v3/uiKlines"
+_EXCHANGE_INFO_URL = BASE_URL + "/api/v3/exchangeInfo"
+_TRADES_URL = BASE_URL + "/api/v3/trades"
+_HISTORICAL_TRADES_URL = BASE_URL + "/api/v3/historicalTrades"
+_AGG_TRADES_URL = BASE_URL + "/api/v3/aggTrades"
+_TICKER_24HR_URL = BASE_URL + "/api/v3/ticker/24hr"
+_TRADING_DAY_TICKER_URL = BASE_URL + "/api/v3/ticker/tradingDay"
+_AVG_PRICE_URL = BASE_URL + "/api/v3/avgPrice"
+_ROLLING_WINDOW_TICKER_URL = BASE_URL + "/api/v3/ticker"
+_BOOK_TICKER_URL = BASE_URL + "/api/v3/ticker/bookTicker"
+
+# Shared HTTP session so every call reuses pooled keep-alive connections to
+# api.binance.com instead of paying a new TCP + TLS handshake per request.
+# Tools run these functions from worker threads, so the pool is sized for
+# several concurrent requests against the single Binance host (one host pool).
+# Rate limits (429, honouring Retry-After) and transient 5xx errors are retried
+# on the same pooled connection with exponential backoff; once retries are used
+# up the last response is returned and surfaces as a BinanceAPIError.
+_RETRY = Retry(
+    total=5,
+    backoff_factor=0.25,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+_POOL_SIZE = 32
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_SIZE, max_retries=_RETRY))
+_SESSION.headers.update({
+    # Ask for compressed bodies in every encoding urllib3 can decode here: gzip/deflate
+    # always, plus br and zstd when the optional brotli/zstandard packages are installed.
+    # Large payloads like exchangeInfo and the all-symbol tickers shrink several-fold
+    # on the wire, and the server picks whichever it supports.
+    "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+    "User-Agent": f"binance-mcp-server/{__version__}",
+})
+if API_KEY:
+    # Public endpoints ignore the key; endpoints like /historicalTrades use it for higher limits
+    _SESSION.headers["X-MBX-APIKEY"] = API_KEY
+
+# (connect, read) timeouts in seconds applied to every REST request. An unreachable node
+# fails fast on connect (just over the 3s TCP retransmit window), while a slow but
+# connected response still gets the full read budget.
+_TIMEOUT = (3.05, 10)
+
+# Request weight Binance allows per IP per minute (see rateLimits in exchangeInfo). Each response
+# reports the weight used so far in X-MBX-USED-WEIGHT-1M; once it nears the limit, requests wait
+# for the next minute rather than earning 429s and, if those are ignored, a temporary IP ban.
+REQUEST_WEIGHT_LIMIT = int(os.getenv("BINANCE_MCP_WEIGHT_LIMIT", "6000"))
+_WEIGHT_THROTTLE_RATIO = 0.9
+_throttle_until = 0.0  # time.time() before which new requests are held back
+
+def _wait_for_weight_budget():
+    """Block the calling worker thread until the per-minute weight budget has reset, if needed."""
+    delay = _throttle_until - time.time()
+    if delay > 0:
+        time.sleep(delay)
+
+def _track_used_weight(resp):
+    """Hold back further requests until the next minute when the used weight nears the limit."""
+    global _throttle_until
+    used = resp.headers.get("X-MBX-USED-WEIGHT-1M")
+    if used is not None and int(used) >= REQUEST_WEIGHT_LIMIT * _WEIGHT_THROTTLE_RATIO:
+        # Binance counts weight per calendar minute
+        now = time.time()
+        _throttle_until = now - now % 60 + 60
+
+# Worker threads for async callers (the MCP tools), one per pooled connection. asyncio's default
+# executor has min(32, cpu_count + 4) threads, which on small machines caps concurrent tool
+# calls well below what the connection pool can serve.
+_EXECUTOR = ThreadPoolExecutor(max_workers=_POOL_SIZE, thread_name_prefix="binance-rest")
+
+async def run_in_thread(func, *args, **kwargs):
+    """Run a blocking function from this module on the REST worker threads and await its result.
+    
+    Keeps the event loop (and any WebSocket streams on it) running while the request is in flight.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_EXECUTOR, functools.partial(func, *args, **kwargs))
+
+def _warm_up_connection():
+    """Open a pooled connection to Binance ahead of the first tool call; failures are ignored."""
+    try:
+        _SESSION.get(_PING_URL, timeout=_TIMEOUT).close()
+    except requests.RequestException:
+        pass
+
+# Opt-in (BINANCE_MCP_WARMUP=1) so importing the module stays free of network side effects
+# by default. When enabled, the TCP + TLS handshake happens in the background at import
+# instead of on the first real request.
+if os.getenv("BINANCE_MCP_WARMUP", "").lower() in ("1", "true", "yes"):
+    threading.Thread(target=_warm_up_connection, name="binance-warmup", daemon=True).start()
+
+# Cache lifetimes (seconds), matched to how often each kind of data changes
+EXCHANGE_INFO_TTL = 3600  # Trading rules and symbol lists change a few times a day at most
+TICKER_TTL = 5            # 24hr statistics and 5-minute average prices drift slowly over a few seconds
+PRICE_TTL = 1             # Live prices and best bid/ask are only reused within the same second
+
+# On-disk copy of exchangeInfo (~1MB) so restarts don't re-download it. Once older than
+# EXCHANGE_INFO_TTL it is revalidated with If-None-Match and only replaced if it changed.
+EXCHANGE_INFO_CACHE_DIR = Path(os.getenv("BINANCE_MCP_CACHE_DIR", "~/.cache/binance-mcp")).expanduser()
+
+_CACHED_FUNCTIONS = []  # Every function wrapped by _ttl_cache, so clear_cache() can reach them all
+
+def _ttl_cache(ttl: float, maxsize: int = 1024):
+    """Cache a function's results in memory for `ttl` seconds, keyed by its arguments.
+    
+    Cached values are shared between callers and must be treated as read-only.
+    Concurrent misses for the same key are coalesced: one caller fetches while
+    the others wait for its result instead of issuing duplicate requests.
+    The wrapped function gains `cache_clear()` to drop all entries, and
+    `cache_get(*args)` / `cache_put(value, *args)` to read or seed the entry for
+    some arguments without calling it (e.g. from a batch request).
+    """
+    def decorator(func):
+        cache = {}
+        in_flight = {}  # key -> lock held by the caller currently fetching it
+        lock = threading.Lock()
+        
+        def store(key, value, expires):
+            """Add an entry; the caller holds `lock`."""
+            # Re-inserted at the end, so the dict stays in insertion order; with one ttl
+            # for every entry that is also expiry order
+            cache.pop(key, None)
+            while len(cache) >= maxsize:
+                # Evict the entry that expires soonest (it may already have expired)
+                del cache[next(iter(cache))]
+            cache[key] = (expires, value)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            entry = cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            
+            with lock:
+                key_lock = in_flight.setdefault(key, threading.Lock())
+            with key_lock:
+                # Another caller may have filled the entry while we waited
+                entry = cache.get(key)
+                now = time.monotonic()
+                if entry is not None and entry[0] > now:
+                    return entry[1]
+                try:
+                    value = func(*args, **kwargs)
+                except BaseException:
+                    with lock:
+                        in_flight.pop(key, None)
+                    raise
+                # Stored and released together, so a caller arriving now finds either the
+                # value or the in-flight lock, never neither
+                with lock:
+                    store(key, value, now + ttl)
+                    in_flight.pop(key, None)
+            return value
+        
+        def cache_get(*args, **kwargs):
+            """Return the fresh cached result for these arguments, or None; never calls `func`."""
+            entry = cache.get((args, tuple(sorted(kwargs.items()))))
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            return None
+        
+        def cache_put(value, *args, **kwargs):
+            """Cache `value` as the result for these arguments."""
+            with lock:
+                store((args, tuple(sorted(kwargs.items()))), value, time.monotonic() + ttl)
+        
+        wrapper.cache_clear = cache.clear
+        wrapper.cache_get = cache_get
+        wrapper.cache_put = cache_put
+        _CACHED_FUNCTIONS.append(wrapper)
+        return wrapper
+    return decorator
+
+def clear_cache():
+    """Drop every in-memory cached response so the next calls fetch fresh data.
+    
+    The on-disk exchange info copy is kept; use refresh_exchange_info() to replace it.
+    """
+    for func in _CACHED_FUNCTIONS:
+        func.cache_clear()
+
+class BinanceAPIError(RuntimeError):
+    """Raised when Binance answers a REST request with a non-2xx status.
+    
+    Attributes:
+        status_code: HTTP status code of the response
+        text: Raw response body (Binance sends {"code": ..., "msg": ...})
+    """
+    
+    def __init__(self, description: str, status_code: int, text: str):
+        super().__init__(f"Error fetching {description}: HTTP {status_code} - {text}")
+        self.status_code = status_code
+        self.text = text
+
+def _request(url: str, description: str, params: dict = None, headers: dict = None):
+    """Send a GET request to Binance and return the decoded JSON body.
+    
+    Args:
+        url: Full endpoint URL
+        description: Short name of the data being fetched, used in error messages
+        params: Optional query parameters
+        headers: Optional extra request headers
+        
+    Raises:
+        BinanceAPIError: If Binance responds with a non-2xx status.
+    """
+    _wait_for_weight_budget()
+    resp = _SESSION.get(url, params=params, headers=headers, timeout=_TIMEOUT)
+    _track_used_weight(resp)
+    if not resp.ok:
+        raise BinanceAPIError(description, resp.status_code, resp.text)
+    return orjson.loads(resp.content)
+
 def ping() -> bool:
     """Test connectivity to the Binance API.
     
     Returns:
         True if ping was successful, False otherwise.
     """
-    url = f"{BASE_URL}/api/v3/ping"
-    resp = requests.get(url)
-    if not resp.ok:
-        raise RuntimeError(f"Error pinging Binance API: HTTP {resp.status_code} - {resp.text}")
+    _request(_PING_URL, "ping")
     return True
 
 def get_server_time() -> int:
@@ -26,62 +264,201 @@ def get_server_time() -> int:
     Returns:
         Server time in milliseconds (UNIX timestamp).
     """
-    url = f"{BASE_URL}/api/v3/time"
-    resp = requests.get(url)
-    if not resp.ok:
-        raise RuntimeError(f"Error fetching server time: HTTP {resp.status_code} - {resp.text}")
-    data = resp.json()
-    return data["serverTime"]
+    data = _request(_TIME_URL, "server time")
+    try:
+        return data["serverTime"]
+    except KeyError:
+        raise RuntimeError(f"Unexpected response for server time: {data}") from None
 
+@_ttl_cache(PRICE_TTL)
 def get_live_price(symbol: str) -> float:
     """Fetch the latest trade price for a given symbol (e.g., 'BTCUSDT')."""
-    url = f"{BASE_URL}/api/v3/ticker/price"
     params = {"symbol": symbol}
-    resp = requests.get(url, params=params)
-    if not resp.ok:
-        raise RuntimeError(f"Error fetching price: HTTP {resp.status_code} - {resp.text}")
-    data = resp.json()
+    data = _request(_PRICE_URL, "price", params)
     # Binance returns JSON like {"symbol": "BTCUSDT", "price": "30000.00"}
-    if "price" not in data:
-        raise RuntimeError(f"Unexpected response for price: {data}")
-    return float(data["price"])
+    try:
+        return float(data["price"])
+    except KeyError:
+        raise RuntimeError(f"Unexpected response for price: {data}") from None
+
+def get_live_prices(symbols: list) -> dict:
+    """Fetch the latest trade prices for several symbols in a single request.
+    
+    Args:
+        symbols: List of trading pair symbols (e.g., ['BTCUSDT', 'ETHUSDT'])
+        
+    Returns:
+        Dictionary mapping each symbol to its latest price as a float.
+    """
+    params = {"symbols": _symbols_param(symbols)}
+    data = _request(_PRICE_URL, "prices", params)
+    # Binance returns a list like [{"symbol": "BTCUSDT", "price": "30000.00"}, ...]
+    return {item["symbol"]: float(item["price"]) for item in data}
+
+def _decode_levels(levels: list) -> list:
+    """Convert raw [price, qty] string pairs into (price, qty) float tuples."""
+    to_float = float
+    return [(to_float(price), to_float(qty)) for price, qty in levels]
 
-def get_order_book(symbol: str, limit: int = 100) -> dict:
-    """Fetch a snapshot of the current order book (bids and asks) for a symbol."""
-    url = f"{BASE_URL}/api/v3/depth"
+def get_order_book(symbol: str, limit: int = 100, columnar: bool = False) -> dict:
+    """Fetch a snapshot of the current order book (bids and asks) for a symbol.
+    
+    With columnar=True each side is a dict of two float lists ({"price": [...], "qty": [...]})
+    instead of a list of (price, qty) pairs, which is far more compact for deep books.
+    """
     params = {"symbol": symbol, "limit": limit}
-    resp = requests.get(url, params=params)
-    if not resp.ok:
-        raise RuntimeError(f"Error fetching order book: {resp.status_code} - {resp.text}")
-    data = resp.json()
-    # Example data: {"lastUpdateId": 123456, "bids": [["10000.0","0.5"], ...], "asks": [...]} 
-    return data  # Return the JSON with bids and asks as lists of [price, quantity]
+    data = _request(_DEPTH_URL, "order book", params)
+    # Example data: {"lastUpdateId": 123456, "bids": [["10000.0","0.5"], ...], "asks": [...]}
+    if columnar:
+        return {
+            "lastUpdateId": data["lastUpdateId"],
+            "bids": _columns(data["bids"], _LEVEL_COLUMNS),
+            "asks": _columns(data["asks"], _LEVEL_COLUMNS),
+        }
+    # Bids and asks are returned as lists of (price, quantity) floats
+    return {
+        "lastUpdateId": data["lastUpdateId"],
+        "bids": _decode_levels(data["bids"]),
+        "asks": _decode_levels(data["asks"]),
+    }
+
+class _Record:
+    """Base for the fixed-shape rows returned by the kline and trade endpoints.
+    
+    Subclasses are slotted dataclasses, so each row costs well under half the
+    memory of the equivalent dict and is built with a positional call. They
+    serialize to JSON objects like dicts do.
+    """
+    __slots__ = ()
+    
+    def as_dict(self) -> dict:
+        """Return the record as a plain dict keyed by field name."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+@dataclass(slots=True)
+class Kline(_Record):
+    """One OHLCV candlestick."""
+    open_time: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+@dataclass(slots=True)
+class Trade(_Record):
+    """One trade from /trades or /historicalTrades."""
+    id: int
+    price: float
+    qty: float
+    time: int
+    isBuyerMaker: bool
+    isBestMatch: bool
+
+@dataclass(slots=True)
+class AggTrade(_Record):
+    """One compressed/aggregate trade."""
+    id: int
+    price: float
+    qty: float
+    first_trade_id: int
+    last_trade_id: int
+    time: int
+    is_buyer_maker: bool
+    is_best_match: bool
+
+# Column layouts for columnar (struct-of-arrays) results: (output name, source key, converter)
+_KLINE_COLUMNS = (
+    ("open_time", 0, None),
+    ("open", 1, float),
+    ("high", 2, float),
+    ("low", 3, float),
+    ("close", 4, float),
+    ("volume", 5, float),
+)
+_LEVEL_COLUMNS = (
+    ("price", 0, float),
+    ("qty", 1, float),
+)
+_TRADE_COLUMNS = (
+    ("id", "id", None),
+    ("price", "price", float),
+    ("qty", "qty", float),
+    ("time", "time", None),
+    ("isBuyerMaker", "isBuyerMaker", None),
+    ("isBestMatch", "isBestMatch", None),
+)
+_AGG_TRADE_COLUMNS = (
+    ("id", "a", None),
+    ("price", "p", float),
+    ("qty", "q", float),
+    ("first_trade_id", "f", None),
+    ("last_trade_id", "l", None),
+    ("time", "T", None),
+    ("is_buyer_maker", "m", None),
+    ("is_best_match", "M", None),
+)
+
+def _columns(data: list, layout: tuple) -> dict:
+    """Pivot raw API rows into one list per field (struct-of-arrays).
+    
+    Each column is extracted and converted with C-level map() calls, and the
+    result holds a handful of lists instead of one dict per row.
+    """
+    columns = {}
+    for name, key, convert in layout:
+        values = map(itemgetter(key), data)
+        columns[name] = list(map(convert, values) if convert else values)
+    return columns
+
+def to_records(columns: dict) -> list:
+    """Convert a columnar result (dict of equal-length lists) back into a list of row dicts."""
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
 
-def get_historical_klines(symbol: str, interval: str = "1d", limit: int = 100) -> list:
+def _decode_klines(data: list) -> list:
+    """Convert raw kline rows into a list of Kline records."""
+    # Each entry: [open_time, open, high, low, close, volume, close_time, quote_asset_volume, trades, ...]
+    to_float = float
+    return [
+        Kline(entry[0], to_float(entry[1]), to_float(entry[2]), to_float(entry[3]),
+              to_float(entry[4]), to_float(entry[5]))
+        for entry in data
+    ]
+
+@functools.lru_cache(maxsize=64)
+def _projected_kline_columns(fields: tuple) -> tuple:
+    """Return the kline column layout restricted to `fields`, in the order given."""
+    layout = {column[0]: column for column in _KLINE_COLUMNS}
+    unknown = [field for field in fields if field not in layout]
+    if unknown:
+        raise ValueError(f"Unknown kline field(s): {', '.join(unknown)}")
+    return tuple(layout[field] for field in fields)
+
+def _format_klines(data: list, columnar: bool, fields: list = None) -> Union[list, dict]:
+    """Convert raw kline rows into records, columns, or only the requested fields of either."""
+    if fields:
+        # Only the requested columns are converted, e.g. one float per candle for ['close']
+        columns = _columns(data, _projected_kline_columns(tuple(fields)))
+        return columns if columnar else to_records(columns)
+    if columnar:
+        return _columns(data, _KLINE_COLUMNS)
+    return _decode_klines(data)
+
+def get_historical_klines(symbol: str, interval: str = "1d", limit: int = 100,
+                          columnar: bool = False, fields: list = None) -> Union[list, dict]:
     """Fetch historical price data (candlesticks) for a symbol and interval.
-    Returns a list of OHLCV candlestick data up to the specified limit."""
-    url = f"{BASE_URL}/api/v3/klines"
+    Returns a list of OHLCV candlestick data up to the specified limit, or with
+    columnar=True a dict of lists keyed by field (open_time, open, high, ...).
+    With `fields` (e.g. ['close']) only those fields are returned; an unknown
+    field raises ValueError."""
     params = {"symbol": symbol, "interval": interval, "limit": limit}
-    resp = requests.get(url, params=params)
-    if not resp.ok:
-        raise RuntimeError(f"Error fetching klines: {resp.status_code} - {resp.text}")
-    data = resp.json()
-    # Each entry: [open_time, open, high, low, close, volume, close_time, quote_asset_volume, trades, ...]
+    data = _request(_KLINES_URL, "klines", params)
     # Convert numeric fields from strings to float for convenience
-    candles = []
-    for entry in data:
-        open_time, open_price, high_price, low_price, close_price, volume = entry[0:6]
-        candles.append({
-            "open_time": open_time,
-            "open": float(open_price),
-            "high": float(high_price),
-            "low": float(low_price),
-            "close": float(close_price),
-            "volume": float(volume)
-        })
-    return candles
-
-def get_ui_klines(symbol: str, interval: str = "1d", limit: int = 100) -> list:
+    return _format_klines(data, columnar, fields)
+
+def get_ui_klines(symbol: str, interval: str = "1d", limit: int = 100,
+                  columnar: bool = False, fields: list = None) -> Union[list, dict]:
     """Fetch UI optimized candlestick data (UIKlines) for a symbol and interval.
     
     This endpoint returns candlestick data optimized for presentation of a candlestick chart.
@@ -91,40 +468,90 @@ def get_ui_klines(symbol: str, interval: str = "1d", limit: int = 100) -> list:
         symbol: Trading pair symbol (e.g., 'BTCUSDT')
         interval: Candlestick interval (e.g., '1m', '15m', '1h', '1d')
         limit: Number of data points to retrieve (max 1000)
+        columnar: Return a dict of lists keyed by field instead of one record per candle
+        fields: Optional list of fields to return (e.g., ['close']) instead of all of them
         
     Returns:
         List of candlestick data optimized for UI presentation.
+        
+    Raises:
+        ValueError: If `fields` names a field klines do not have.
     """
-    url = f"{BASE_URL}/api/v3/uiKlines"
     params = {"symbol": symbol, "interval": interval, "limit": limit}
-    resp = requests.get(url, params=params)
-    if not resp.ok:
-        raise RuntimeError(f"Error fetching UI klines: HTTP {resp.status_code} - {resp.text}")
-    data = resp.json()
+    data = _request(_UI_KLINES_URL, "UI klines", params)
     # Format is same as regular klines
-    candles = []
-    for entry in data:
-        open_time, open_price, high_price, low_price, close_price, volume = entry[0:6]
-        candles.append({
-            "open_time": open_time,
-            "open": float(open_price),
-            "high": float(high_price),
-            "low": float(low_price),
-            "close": float(close_price),
-            "volume": float(volume)
-        })
-    return candles
+    return _format_klines(data, columnar, fields)
+
+def _read_exchange_info_cache():
+    """Return (body, etag, age_seconds) for the on-disk exchangeInfo copy, or None if absent."""
+    body_path = EXCHANGE_INFO_CACHE_DIR / "exchangeInfo.json"
+    etag_path = EXCHANGE_INFO_CACHE_DIR / "exchangeInfo.etag"
+    try:
+        body = body_path.read_bytes()
+        age = time.time() - body_path.stat().st_mtime
+        etag = etag_path.read_text().strip() if etag_path.exists() else None
+    except OSError:
+        return None
+    return body, etag, age
+
+def _write_exchange_info_cache(body: bytes, etag: str = None):
+    """Store the exchangeInfo body (and its ETag) on disk; failures only cost a re-download."""
+    body_path = EXCHANGE_INFO_CACHE_DIR / "exchangeInfo.json"
+    etag_path = EXCHANGE_INFO_CACHE_DIR / "exchangeInfo.etag"
+    try:
+        EXCHANGE_INFO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = body_path.with_suffix(".tmp")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, body_path)
+        if etag:
+            etag_path.write_text(etag)
+        elif etag_path.exists():
+            etag_path.unlink()
+    except OSError:
+        pass
 
+@_ttl_cache(EXCHANGE_INFO_TTL, maxsize=1)
 def get_exchange_info() -> dict:
-    """Retrieve exchange information (trading rules, symbol list, etc.)."""
-    url = f"{BASE_URL}/api/v3/exchangeInfo"
-    resp = requests.get(url)
+    """Retrieve exchange information (trading rules, symbol list, etc.).
+    
+    The response is cached on disk. A fresh copy is returned without a request;
+    a stale one is revalidated with its ETag, so an unchanged payload costs a
+    bodyless 304 instead of a full download.
+    """
+    cached = _read_exchange_info_cache()
+    if cached is not None and cached[2] < EXCHANGE_INFO_TTL:
+        return orjson.loads(cached[0])
+    
+    headers = {"If-None-Match": cached[1]} if cached is not None and cached[1] else None
+    _wait_for_weight_budget()
+    resp = _SESSION.get(_EXCHANGE_INFO_URL, headers=headers, timeout=_TIMEOUT)
+    _track_used_weight(resp)
+    if resp.status_code == 304 and cached is not None:
+        # Unchanged: rewrite the cached copy to reset its age
+        _write_exchange_info_cache(cached[0], cached[1])
+        return orjson.loads(cached[0])
     if not resp.ok:
-        raise RuntimeError(f"Error fetching exchange info: {resp.status_code}")
-    data = resp.json()
+        raise BinanceAPIError("exchange info", resp.status_code, resp.text)
+    
     # This returns a lot of metadata including rate limits and all symbols with their filters.
+    data = orjson.loads(resp.content)
+    _write_exchange_info_cache(resp.content, resp.headers.get("ETag"))
     return data
 
+def refresh_exchange_info() -> dict:
+    """Discard the in-memory and on-disk exchange info copies and fetch a new one.
+    
+    Use this when trading rules are known to have changed (e.g., a new listing)
+    and waiting out EXCHANGE_INFO_TTL is not acceptable.
+    """
+    get_exchange_info.cache_clear()
+    for name in ("exchangeInfo.json", "exchangeInfo.etag"):
+        try:
+            (EXCHANGE_INFO_CACHE_DIR / name).unlink()
+        except OSError:
+            pass
+    return get_exchange_info()
+
 def get_trading_fees() -> dict:
     """Get current trading fee rates (maker & taker fees). 
     Binance's public API does not expose account-specific fees without authentication.
@@ -133,35 +560,42 @@ def get_trading_fees() -> dict:
     # Typically 0.1% maker and 0.1% taker (represented as 0.001 in decimal).
     return {"maker_fee": 0.001, "taker_fee": 0.001}
 
-def get_recent_trades(symbol: str, limit: int = 500) -> list:
+def _decode_trades(data: list) -> list:
+    """Convert raw trade objects (from /trades or /historicalTrades) into Trade records."""
+    to_float = float
+    return [
+        Trade(trade["id"], to_float(trade["price"]), to_float(trade["qty"]), trade["time"],
+              trade["isBuyerMaker"], trade["isBestMatch"])
+        for trade in data
+    ]
+
+def _decode_agg_trades(data: list) -> list:
+    """Convert raw aggregate trade objects (single-letter keys) into AggTrade records."""
+    to_float = float
+    return [
+        AggTrade(trade["a"], to_float(trade["p"]), to_float(trade["q"]), trade["f"], trade["l"],
+                 trade["T"], trade["m"], trade["M"])
+        for trade in data
+    ]
+
+def get_recent_trades(symbol: str, limit: int = 500, columnar: bool = False) -> Union[list, dict]:
     """Fetch recent trades for a given symbol.
     
     Args:
         symbol: Trading pair symbol (e.g., 'BTCUSDT')
         limit: Number of trades to fetch (default 500, max 1000)
+        columnar: Return a dict of lists keyed by field instead of one dict per trade
         
     Returns:
         List of recent trades with details like price, quantity, time, etc.
     """
-    url = f"{BASE_URL}/api/v3/trades"
     params = {"symbol": symbol, "limit": limit}
-    resp = requests.get(url, params=params)
-    if not resp.ok:
-        raise RuntimeError(f"Error fetching recent trades: HTTP {resp.status_code} - {resp.text}")
-    data = resp.json()
+    data = _request(_TRADES_URL, "recent trades", params)
     # Example trade: {"id": 28457, "price": "4.00000100", "qty": "12.00000000", "time": 1499865549590, ...}
     # Convert numeric fields from strings to appropriate types
-    trades = []
-    for trade in data:
-        trades.append({
-            "id": trade["id"],
-            "price": float(trade["price"]),
-            "qty": float(trade["qty"]),
-            "time": trade["time"],
-            "isBuyerMaker": trade["isBuyerMaker"],
-            "isBestMatch": trade["isBestMatch"]
-        })
-    return trades
+    if columnar:
+        return _columns(data, _TRADE_COLUMNS)
+    return _decode_trades(data)
 
 def get_historical_trades(symbol: str, limit: int = 500, from_id: int = None) -> list:
     """Fetch historical trades for a given symbol.
@@ -177,35 +611,17 @@ def get_historical_trades(symbol: str, limit: int = 500, from_id: int = None) ->
     Returns:
         List of historical trades with details like price, quantity, time, etc.
     """
-    url = f"{BASE_URL}/api/v3/historicalTrades"
     params = {"symbol": symbol, "limit": limit}
     if from_id:
         params["fromId"] = from_id
     
-    headers = {}
-    if API_KEY:
-        # If API_KEY is defined, include in request header
-        headers["X-MBX-APIKEY"] = API_KEY
-    
-    resp = requests.get(url, params=params, headers=headers)
-    if not resp.ok:
-        raise RuntimeError(f"Error fetching historical trades: HTTP {resp.status_code} - {resp.text}")
-    data = resp.json()
+    # The X-MBX-APIKEY header is set on the shared session when BINANCE_API_KEY is configured
+    data = _request(_HISTORICAL_TRADES_URL, "historical trades", params)
     
     # Process the data like recent trades
-    trades = []
-    for trade in data:
-        trades.append({
-            "id": trade["id"],
-            "price": float(trade["price"]),
-            "qty": float(trade["qty"]),
-            "time": trade["time"],
-            "isBuyerMaker": trade["isBuyerMaker"],
-            "isBestMatch": trade["isBestMatch"]
-        })
-    return trades
-
-def get_aggregate_trades(symbol: str, limit: int = 500) -> list:
+    return _decode_trades(data)
+
+def get_aggregate_trades(symbol: str, limit: int = 500, columnar: bool = False) -> Union[list, dict]:
     """Fetch aggregate trades for a given symbol.
     
     Aggregate trades are trades that have been filled at the same time, with the same price and the same order.
@@ -213,79 +629,219 @@ def get_aggregate_trades(symbol: str, limit: int = 500) -> list:
     Args:
         symbol: Trading pair symbol (e.g., 'BTCUSDT')
         limit: Number of aggregate trades to fetch (default 500, max 1000)
+        columnar: Return a dict of lists keyed by field instead of one dict per trade
         
     Returns:
         List of aggregate trades with details like price, quantity, time, etc.
     """
-    url = f"{BASE_URL}/api/v3/aggTrades"
     params = {"symbol": symbol, "limit": limit}
-    resp = requests.get(url, params=params)
-    if not resp.ok:
-        raise RuntimeError(f"Error fetching aggregate trades: HTTP {resp.status_code} - {resp.text}")
-    data = resp.json()
+    data = _request(_AGG_TRADES_URL, "aggregate trades", params)
     # Example: {"a": 26129, "p": "0.01633102", "q": "4.70443515", "f": 27781, "l": 27781, "T": 1498793709153, ...}
     # Convert numeric fields from strings to appropriate types
-    trades = []
-    for trade in data:
-        trades.append({
-            "id": trade["a"],
-            "price": float(trade["p"]),
-            "qty": float(trade["q"]),
-            "first_trade_id": trade["f"],
-            "last_trade_id": trade["l"],
-            "time": trade["T"],
-            "is_buyer_maker": trade["m"],
-            "is_best_match": trade["M"]
-        })
-    return trades
-
-def get_24hr_ticker(symbol: str = None) -> dict:
+    if columnar:
+        return _columns(data, _AGG_TRADE_COLUMNS)
+    return _decode_agg_trades(data)
+
+def _symbols_param(symbols: list) -> str:
+    """Encode a list of symbols as the compact JSON array Binance expects, e.g. '["BTCUSDT","ETHUSDT"]'.
+    
+    Duplicates are dropped (keeping order), since Binance rejects a batch that repeats a symbol.
+    """
+    return orjson.dumps(list(dict.fromkeys(symbols))).decode()
+
+def _compile_parser(name: str, fields: tuple, float_fields: frozenset):
+    """Generate a fixed-schema parser that copies `fields` from an API object into a new dict.
+    
+    Fields listed in `float_fields` are converted from numeric strings to floats.
+    The generated body is a single dict display with every key and float() call
+    spelled out, so each call runs straight-line code with constant keys instead
+    of looping over a schema.
+    """
+    items = ", ".join(
+        f"{key!r}: float(d[{key!r}])" if key in float_fields else f"{key!r}: d[{key!r}]"
+        for key in fields
+    )
+    namespace = {}
+    exec(f"def {name}(d):\n    return {{{items}}}\n", namespace)
+    return namespace[name]
+
+# Response schemas for single-symbol ticker objects, in output order
+_TICKER_24HR_FIELDS = (
+    "symbol", "priceChange", "priceChangePercent", "weightedAvgPrice", "prevClosePrice",
+    "lastPrice", "lastQty", "bidPrice", "bidQty", "askPrice", "askQty", "openPrice",
+    "highPrice", "lowPrice", "volume", "quoteVolume", "openTime", "closeTime", "count",
+)
+_BOOK_TICKER_FIELDS = ("symbol", "bidPrice", "bidQty", "askPrice", "askQty")
+# Trading day and rolling window tickers share a schema; MINI drops the change/average fields
+_WINDOW_TICKER_FULL_FIELDS = (
+    "symbol", "priceChange", "priceChangePercent", "weightedAvgPrice", "openPrice", "highPrice",
+    "lowPrice", "lastPrice", "volume", "quoteVolume", "openTime", "closeTime", "firstId",
+    "lastId", "count",
+)
+_WINDOW_TICKER_MINI_FIELDS = (
+    "symbol", "openPrice", "highPrice", "lowPrice", "lastPrice", "volume", "quoteVolume",
+    "openTime", "closeTime", "firstId", "lastId", "count",
+)
+# Numeric-string fields that are converted to floats; everything else is passed through
+_TICKER_FLOAT_FIELDS = frozenset({
+    "priceChange", "priceChangePercent", "weightedAvgPrice", "prevClosePrice", "lastPrice",
+    "lastQty", "bidPrice", "bidQty", "askPrice", "askQty", "openPrice", "highPrice",
+    "lowPrice", "volume", "quoteVolume",
+})
+
+# Convert the numeric string fields of a single ticker object to floats, e.g.
+# {"symbol": "LTCBTC", "bidPrice": "4.00000000", ...} -> {"symbol": "LTCBTC", "bidPrice": 4.0, ...}
+_parse_24hr_ticker = _compile_parser("_parse_24hr_ticker", _TICKER_24HR_FIELDS, _TICKER_FLOAT_FIELDS)
+_parse_book_ticker = _compile_parser("_parse_book_ticker", _BOOK_TICKER_FIELDS, _TICKER_FLOAT_FIELDS)
+# Single-symbol trading day / rolling window parsers, specialized per response type
+_WINDOW_TICKER_PARSERS = {
+    "FULL": _compile_parser("_parse_window_ticker_full", _WINDOW_TICKER_FULL_FIELDS, _TICKER_FLOAT_FIELDS),
+    "MINI": _compile_parser("_parse_window_ticker_mini", _WINDOW_TICKER_MINI_FIELDS, _TICKER_FLOAT_FIELDS),
+}
+
+def _window_ticker_type(type: str) -> str:
+    """Normalize a trading day / rolling window ticker `type` (e.g. 'mini' -> 'MINI').
+    
+    Raises:
+        ValueError: If `type` is not FULL or MINI.
+    """
+    normalized = type.upper()
+    if normalized not in _WINDOW_TICKER_PARSERS:
+        raise ValueError(f"Invalid ticker type: {type}. Must be one of {', '.join(_WINDOW_TICKER_PARSERS)}.")
+    return normalized
+
+@functools.lru_cache(maxsize=64)
+def _projected_24hr_parser(fields: tuple):
+    """Return a generated parser that extracts only `fields` from a 24hr ticker object."""
+    unknown = [field for field in fields if field not in _TICKER_24HR_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown 24hr ticker field(s): {', '.join(unknown)}")
+    return _compile_parser("_parse_24hr_ticker_projection", fields, _TICKER_FLOAT_FIELDS)
+
+@_ttl_cache(TICKER_TTL)
+def _fetch_24hr_ticker(symbol: str = None):
+    """Fetch the raw 24hr ticker object for `symbol`, or the list for all symbols."""
+    params = {}
+    if symbol:
+        params["symbol"] = symbol
+    return _request(_TICKER_24HR_URL, "24hr ticker", params)
+
+def get_24hr_ticker(symbol: str = None, fields: list = None) -> dict:
     """Fetch 24-hour price change statistics.
     
     Args:
         symbol: Optional symbol to get data for. If not provided, returns data for all symbols.
+        fields: Optional list of field names to return (e.g., ['lastPrice']). Only these
+            fields are converted, instead of all of them. For all symbols, each entry
+            also keeps its "symbol".
         
     Returns:
-        Dictionary containing statistics for the last 24 hours.
+        Dictionary containing statistics for the last 24 hours, or a list of them for all symbols.
+        
+    Raises:
+        ValueError: If `fields` names a field the 24hr ticker does not have.
     """
-    url = f"{BASE_URL}/api/v3/ticker/24hr"
-    params = {}
-    if symbol:
-        params["symbol"] = symbol
-    
-    resp = requests.get(url, params=params)
-    if not resp.ok:
-        raise RuntimeError(f"Error fetching 24hr ticker: HTTP {resp.status_code} - {resp.text}")
-    
-    data = resp.json()
     # If symbol is provided, we get a single object, otherwise a list of objects
     if symbol:
-        # Convert numeric fields to appropriate types
-        return {
-            "symbol": data["symbol"],
-            "priceChange": float(data["priceChange"]),
-            "priceChangePercent": float(data["priceChangePercent"]),
-            "weightedAvgPrice": float(data["weightedAvgPrice"]),
-            "prevClosePrice": float(data["prevClosePrice"]),
-            "lastPrice": float(data["lastPrice"]),
-            "lastQty": float(data["lastQty"]),
-            "bidPrice": float(data["bidPrice"]),
-            "bidQty": float(data["bidQty"]),
-            "askPrice": float(data["askPrice"]),
-            "askQty": float(data["askQty"]),
-            "openPrice": float(data["openPrice"]),
-            "highPrice": float(data["highPrice"]),
-            "lowPrice": float(data["lowPrice"]),
-            "volume": float(data["volume"]),
-            "quoteVolume": float(data["quoteVolume"]),
-            "openTime": data["openTime"],
-            "closeTime": data["closeTime"],
-            "count": data["count"]
-        }
+        data = _fetch_24hr_ticker(symbol)
+        if fields:
+            return _projected_24hr_parser(tuple(fields))(data)
+        return _parse_24hr_ticker(data)
     else:
+        if fields:
+            # Projecting a few fields shrinks the ~2000-entry list several-fold
+            projection = ("symbol",) + tuple(f for f in fields if f != "symbol")
+            parse = _projected_24hr_parser(projection)
+            data = _fetch_24hr_ticker.cache_get(symbol)
+            if data is None and ijson is not None:
+                # Nothing cached to reuse, so only the projection is kept as the response is parsed
+                return _stream_24hr_projection(projection)
+            if data is None:
+                data = _fetch_24hr_ticker(symbol)
+            return [parse(item) for item in data]
         # Return the list of ticker data for all symbols (could be large)
-        # Consider limiting the number of fields returned if all symbols are requested
-        return data
+        return _fetch_24hr_ticker(symbol)
+
+@_ttl_cache(TICKER_TTL)
+def _stream_24hr_projection(fields: tuple) -> list:
+    """Fetch every symbol's 24hr ticker through iter_24hr_ticker, keeping only `fields` of each."""
+    parse = _projected_24hr_parser(fields)
+    return [parse(item) for item in iter_24hr_ticker()]
+
+def get_24hr_tickers(symbols: list) -> dict:
+    """Fetch 24-hour price change statistics for several symbols in a single request.
+    
+    Symbols with a fresh cached entry are served from the cache; only the rest are
+    requested, and their results are cached for the single-symbol lookups too.
+    
+    Args:
+        symbols: List of trading pair symbols (e.g., ['BTCUSDT', 'ETHUSDT'])
+        
+    Returns:
+        Dictionary mapping each symbol to its 24-hour statistics.
+    """
+    result = {}
+    missing = []
+    for symbol in dict.fromkeys(symbols):
+        cached = _fetch_24hr_ticker.cache_get(symbol)
+        if cached is not None:
+            result[symbol] = _parse_24hr_ticker(cached)
+        else:
+            missing.append(symbol)
+    if missing:
+        params = {"symbols": _symbols_param(missing)}
+        for item in _request(_TICKER_24HR_URL, "24hr tickers", params):
+            # Seed the single-symbol cache so get_24hr_ticker reuses this response
+            _fetch_24hr_ticker.cache_put(item, item["symbol"])
+            result[item["symbol"]] = _parse_24hr_ticker(item)
+    return result
+
+def get_cached_24hr_ticker(symbol: str) -> Optional[dict]:
+    """Return the 24hr statistics for `symbol` if a fresh copy is cached, without a request.
+    
+    Args:
+        symbol: Trading pair symbol (e.g., 'BTCUSDT')
+        
+    Returns:
+        Dictionary of statistics as returned by get_24hr_ticker, or None if not cached.
+    """
+    cached = _fetch_24hr_ticker.cache_get(symbol)
+    return _parse_24hr_ticker(cached) if cached is not None else None
+
+def iter_24hr_ticker(symbols_filter: set = None):
+    """Iterate over the all-symbols 24hr ticker response, optionally keeping only some symbols.
+    
+    With `ijson` installed the response is parsed incrementally from the socket, so
+    only the objects that pass the filter are ever held in memory. Without it the
+    body is decoded in one go and filtered afterwards.
+    
+    Args:
+        symbols_filter: Optional set of symbols to keep. If not provided, every symbol is yielded.
+        
+    Yields:
+        Raw 24hr ticker objects, one per symbol.
+        
+    Raises:
+        BinanceAPIError: If Binance responds with a non-2xx status.
+    """
+    if ijson is None:
+        items = _request(_TICKER_24HR_URL, "24hr ticker")
+    else:
+        _wait_for_weight_budget()
+        resp = _SESSION.get(_TICKER_24HR_URL, stream=True, timeout=_TIMEOUT)
+        _track_used_weight(resp)
+        if not resp.ok:
+            raise BinanceAPIError("24hr ticker", resp.status_code, resp.text)
+        # Let urllib3 undo gzip/brotli so ijson reads plain JSON off the raw stream
+        resp.raw.decode_content = True
+        items = ijson.items(resp.raw, "item", use_float=True)
+    try:
+        for item in items:
+            if symbols_filter is None or item["symbol"] in symbols_filter:
+                yield item
+    finally:
+        if ijson is not None:
+            resp.close()
 
 def get_trading_day_ticker(symbol: str = None, type: str = "FULL") -> dict:
     """Fetch trading day ticker statistics.
@@ -294,58 +850,29 @@ def get_trading_day_ticker(symbol: str = None, type: str = "FULL") -> dict:
     
     Args:
         symbol: Optional symbol to get data for. If not provided, returns data for all symbols.
-        type: Response type (FULL or MINI). FULL includes all fields, MINI includes fewer fields.
+        type: Response type (FULL or MINI, case-insensitive). FULL includes all fields, MINI includes fewer fields.
         
     Returns:
         Dictionary containing statistics for the current trading day.
+        
+    Raises:
+        ValueError: If `type` is not FULL or MINI.
     """
-    url = f"{BASE_URL}/api/v3/ticker/tradingDay"
+    type = _window_ticker_type(type)
     params = {"type": type}
     if symbol:
         params["symbol"] = symbol
     
-    resp = requests.get(url, params=params)
-    if not resp.ok:
-        raise RuntimeError(f"Error fetching trading day ticker: HTTP {resp.status_code} - {resp.text}")
-    
-    data = resp.json()
+    data = _request(_TRADING_DAY_TICKER_URL, "trading day ticker", params)
     # If symbol is provided, we get a single object, otherwise a list of objects
     if symbol:
-        # Convert numeric fields to appropriate types
-        processed_data = {
-            "symbol": data["symbol"],
-            "priceChange": float(data["priceChange"]),
-            "priceChangePercent": float(data["priceChangePercent"]),
-            "openPrice": float(data["openPrice"]),
-            "highPrice": float(data["highPrice"]),
-            "lowPrice": float(data["lowPrice"]),
-            "lastPrice": float(data["lastPrice"]),
-            "volume": float(data["volume"]),
-            "quoteVolume": float(data["quoteVolume"]),
-            "openTime": data["openTime"],
-            "closeTime": data["closeTime"],
-            "firstId": data["firstId"],
-            "lastId": data["lastId"],
-            "count": data["count"]
-        }
-        
-        # Additional fields for FULL type
-        if type == "FULL":
-            processed_data.update({
-                "weightedAvgPrice": float(data["weightedAvgPrice"]),
-                "lastQty": float(data["lastQty"]),
-                "bidPrice": float(data["bidPrice"]),
-                "bidQty": float(data["bidQty"]),
-                "askPrice": float(data["askPrice"]),
-                "askQty": float(data["askQty"])
-            })
-            
-        return processed_data
+        return _WINDOW_TICKER_PARSERS[type](data)
     else:
         # Return the list of ticker data for all symbols
         # We won't process this for efficiency when fetching all symbols
         return data
 
+@_ttl_cache(TICKER_TTL)
 def get_average_price(symbol: str) -> float:
     """Fetch current average price for a symbol.
     
@@ -357,14 +884,13 @@ def get_average_price(symbol: str) -> float:
     Returns:
         Current average price as a float.
     """
-    url = f"{BASE_URL}/api/v3/avgPrice"
     params = {"symbol": symbol}
-    resp = requests.get(url, params=params)
-    if not resp.ok:
-        raise RuntimeError(f"Error fetching average price: HTTP {resp.status_code} - {resp.text}")
-    data = resp.json()
+    data = _request(_AVG_PRICE_URL, "average price", params)
     # Example: {"mins": 5, "price": "9.35751834"}
-    return float(data["price"])
+    try:
+        return float(data["price"])
+    except KeyError:
+        raise RuntimeError(f"Unexpected response for average price: {data}") from None
 
 def get_rolling_window_ticker(symbol: str = None, windowSize: str = "1d", type: str = "FULL") -> dict:
     """Fetch rolling window price change statistics.
@@ -374,58 +900,29 @@ def get_rolling_window_ticker(symbol: str = None, windowSize: str = "1d", type:
     Args:
         symbol: Optional symbol to get data for. If not provided, returns data for all symbols.
         windowSize: Size of the rolling window (e.g., "1d", "4h")
-        type: Response type (FULL or MINI). FULL includes all fields, MINI includes fewer fields.
+        type: Response type (FULL or MINI, case-insensitive). FULL includes all fields, MINI includes fewer fields.
         
     Returns:
         Dictionary containing statistics for the rolling window.
+        
+    Raises:
+        ValueError: If `type` is not FULL or MINI.
     """
-    url = f"{BASE_URL}/api/v3/ticker"
+    type = _window_ticker_type(type)
     params = {"windowSize": windowSize, "type": type}
     if symbol:
         params["symbol"] = symbol
     
-    resp = requests.get(url, params=params)
-    if not resp.ok:
-        raise RuntimeError(f"Error fetching rolling window ticker: HTTP {resp.status_code} - {resp.text}")
-    
-    data = resp.json()
+    data = _request(_ROLLING_WINDOW_TICKER_URL, "rolling window ticker", params)
     # If symbol is provided, we get a single object, otherwise a list of objects
     if symbol:
-        # Convert numeric fields to appropriate types
-        processed_data = {
-            "symbol": data["symbol"],
-            "priceChange": float(data["priceChange"]),
-            "priceChangePercent": float(data["priceChangePercent"]),
-            "openPrice": float(data["openPrice"]),
-            "highPrice": float(data["highPrice"]),
-            "lowPrice": float(data["lowPrice"]),
-            "lastPrice": float(data["lastPrice"]),
-            "volume": float(data["volume"]),
-            "quoteVolume": float(data["quoteVolume"]),
-            "openTime": data["openTime"],
-            "closeTime": data["closeTime"],
-            "firstId": data["firstId"],
-            "lastId": data["lastId"],
-            "count": data["count"]
-        }
-        
-        # Additional fields for FULL type
-        if type == "FULL":
-            processed_data.update({
-                "weightedAvgPrice": float(data["weightedAvgPrice"]),
-                "lastQty": float(data["lastQty"]),
-                "bidPrice": float(data["bidPrice"]),
-                "bidQty": float(data["bidQty"]),
-                "askPrice": float(data["askPrice"]),
-                "askQty": float(data["askQty"])
-            })
-            
-        return processed_data
+        return _WINDOW_TICKER_PARSERS[type](data)
     else:
         # Return the list of ticker data for all symbols
         # We won't process this for efficiency when fetching all symbols
         return data
 
+@_ttl_cache(PRICE_TTL)
 def get_book_ticker(symbol: str = None) -> dict:
     """Fetch best price/qty on the order book for a symbol or all symbols.
     
@@ -435,27 +932,54 @@ def get_book_ticker(symbol: str = None) -> dict:
     Returns:
         Dictionary containing the best bid and ask prices and quantities.
     """
-    url = f"{BASE_URL}/api/v3/ticker/bookTicker"
     params = {}
     if symbol:
         params["symbol"] = symbol
     
-    resp = requests.get(url, params=params)
-    if not resp.ok:
-        raise RuntimeError(f"Error fetching book ticker: HTTP {resp.status_code} - {resp.text}")
-    
-    data = resp.json()
+    data = _request(_BOOK_TICKER_URL, "book ticker", params)
     # If symbol is provided, we get a single object, otherwise a list of objects
     if symbol:
-        # Example: {"symbol": "LTCBTC", "bidPrice": "4.00000000", "bidQty": "431.00000000", ...}
-        return {
-            "symbol": data["symbol"],
-            "bidPrice": float(data["bidPrice"]),
-            "bidQty": float(data["bidQty"]),
-            "askPrice": float(data["askPrice"]),
-            "askQty": float(data["askQty"])
-        }
+        return _parse_book_ticker(data)
     else:
         # Return the list of book ticker data for all symbols
         # For all symbols, don't convert to float to save processing time
-        return data 
\ No newline at end of file
+        return data
+
+def get_book_tickers(symbols: list) -> dict:
+    """Fetch best price/qty on the order book for several symbols in a single request.
+    
+    Symbols with a fresh cached entry are served from the cache; only the rest are
+    requested, and their results are cached for the single-symbol lookups too.
+    
+    Args:
+        symbols: List of trading pair symbols (e.g., ['BTCUSDT', 'ETHUSDT'])
+        
+    Returns:
+        Dictionary mapping each symbol to its best bid and ask prices and quantities.
+    """
+    result = {}
+    missing = []
+    for symbol in dict.fromkeys(symbols):
+        cached = get_book_ticker.cache_get(symbol)
+        if cached is not None:
+            result[symbol] = cached
+        else:
+            missing.append(symbol)
+    if missing:
+        params = {"symbols": _symbols_param(missing)}
+        for item in _request(_BOOK_TICKER_URL, "book tickers", params):
+            book = result[item["symbol"]] = _parse_book_ticker(item)
+            # Seed the single-symbol cache so get_book_ticker reuses this response
+            get_book_ticker.cache_put(book, item["symbol"])
+    return result
+
+def get_cached_book_ticker(symbol: str) -> Optional[dict]:
+    """Return the best bid/ask for `symbol` if a fresh copy is cached, without a request.
+    
+    Args:
+        symbol: Trading pair symbol (e.g., 'BTCUSDT')
+        
+    Returns:
+        Dictionary as returned by get_book_ticker, or None if not cached.
+    """
+    return get_book_ticker.cache_get(symbol)
@@ -1,32 +1,124 @@
 # binance_ws_api.py
-import json
 import asyncio
+import functools
+import itertools
 import logging
-from typing import Dict, List, Optional, Callable, Any, Union
+import socket
+from typing import Dict, List, Optional, Callable, Any, Awaitable, Set, Tuple, Union
+import orjson
 import websockets
 from websockets.exceptions import ConnectionClosed
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Logging is configured by the application (see run_server.py), not at import
 logger = logging.getLogger(__name__)
 
 # WebSocket endpoints
 MARKET_WS_BASE_URL = "wss://stream.binance.com:9443"
 API_WS_BASE_URL = "wss://ws-api.binance.com:443/ws-api/v3"
 
+# Stream callbacks receive a parsed event dict, or its JSON text for raw subscriptions
+StreamCallback = Callable[[Any], Awaitable[Any]]
+
 # Global connection and subscription state
 ws_connections = {}
 subscriptions = {}
 
+# JSON keep-alive pings are tiny frames shaped {"ping":...}; recognized by prefix before parsing
+_PING_PREFIX = '{"ping"'
+_PING_PREFIX_BYTES = _PING_PREFIX.encode()
+
+# Combined-stream frames are always shaped {"stream":"<name>","data":{...}}
+_COMBINED_PREFIX = '{"stream":"'
+_COMBINED_DATA_SEP = '","data":'
+
+def _split_combined_frame(message: Union[str, bytes]) -> Optional[tuple]:
+    """Return (stream_name, data_json) for a combined-stream frame without parsing it.
+    
+    Returns None if the frame does not have the combined-stream envelope.
+    """
+    if not isinstance(message, str) or not message.startswith(_COMBINED_PREFIX):
+        return None
+    sep = message.find(_COMBINED_DATA_SEP, len(_COMBINED_PREFIX))
+    if sep < 0:
+        return None
+    return message[len(_COMBINED_PREFIX):sep], message[sep + len(_COMBINED_DATA_SEP):-1]
+
+def _unsubscribe_message(stream_name: str, request_id: int) -> str:
+    """Serialize the UNSUBSCRIBE request text for a stream."""
+    return orjson.dumps({"method": "UNSUBSCRIBE", "params": [stream_name], "id": request_id}).decode()
+
+@functools.lru_cache(maxsize=8192)
+def _stream_name(kind: str, symbol: str, suffix: str = "") -> str:
+    """Stream name like 'btcusdt@kline_1m'; cached since clients resubscribe the same symbols."""
+    return f"{symbol.lower()}@{kind}{suffix}"
+
+@functools.lru_cache(maxsize=128)
+def _pong_message(ping_payload) -> str:
+    """Serialized pong reply; servers reuse a small set of ping payloads, so replies are cached."""
+    return orjson.dumps({"pong": ping_payload}).decode()
+
 class BinanceWebSocketManager:
     """Manager for Binance WebSocket connections and subscriptions."""
     
-    def __init__(self):
-        """Initialize the WebSocket manager."""
-        self.connections = {}  # Map of connection_id -> websocket connection
-        self.subscriptions = {}  # Map of stream_name -> connection_id
-        self.callbacks = {}  # Map of stream_name -> callback function
-        self.running_tasks = set()  # Set of running tasks
+    # Keyword arguments passed to websockets.connect; override on the class or an instance to tune.
+    # Frames like !ticker@arr and deep depth snapshots can exceed the 1 MiB default max_size, and
+    # a larger max_queue lets bursts buffer while callbacks run instead of pausing socket reads.
+    # permessage-deflate is requested explicitly; Binance's JSON compresses several-fold.
+    CONNECT_OPTIONS = {
+        "compression": "deflate",
+        "max_size": 2 ** 22,
+        "max_queue": 1024,
+        "write_limit": 2 ** 16,
+    }
+    
+    # Kernel receive buffer for stream sockets, so bursts of depth updates are not throttled by
+    # a small TCP window while the event loop is busy. None leaves the OS default.
+    SOCKET_RCVBUF = 2 ** 21
+    
+    # Messages buffered per stream while its callback is busy; beyond this the oldest is dropped
+    DISPATCH_QUEUE_SIZE = 1024
+    
+    # Subscribes to combined streams made within this many seconds of each other are sent as one
+    # SUBSCRIBE frame; Binance disconnects clients sending more than 5 messages per second
+    SUBSCRIBE_BATCH_WINDOW = 0.01
+    
+    # Seconds to wait for Binance to acknowledge a SUBSCRIBE when confirm=True
+    REQUEST_TIMEOUT = 10
+    
+    # Reconnect backoff: 0.5s, 1s, 2s, ... capped at this many seconds
+    RECONNECT_MAX_DELAY = 30
+    
+    # Combined-stream connection that subscriptions share unless a connection_id is given.
+    # Binance allows up to 1024 streams on one /stream connection.
+    SHARED_CONNECTION_ID = "combined"
+    
+    def __init__(self, max_retries: int = 10,
+                 on_reconnect: Optional[Callable[[str], Awaitable[Any]]] = None):
+        """Initialize the WebSocket manager.
+        
+        Args:
+            max_retries: Reconnection attempts after a connection drops before giving up on it
+            on_reconnect: Optional async function called with the connection_id after a
+                dropped connection is re-established and its subscriptions replayed
+        """
+        self.max_retries = max_retries
+        self.on_reconnect = on_reconnect
+        self.connections: Dict[str, Any] = {}  # Map of connection_id -> websocket connection
+        self.base_urls: Dict[str, str] = {}  # Map of connection_id -> endpoint it was opened on, for reconnecting
+        self.is_combined: Dict[str, bool] = {}  # Map of connection_id -> whether it is a combined (/stream) connection
+        self.reconnect_attempts: Dict[str, int] = {}  # Map of connection_id -> reconnects since its last received frame
+        self.subscriptions: Dict[str, str] = {}  # Map of stream_name -> connection_id
+        self.callbacks: Dict[str, StreamCallback] = {}  # Map of stream_name -> callback function
+        self.raw_streams: Set[str] = set()  # Streams whose callbacks get the unparsed JSON text
+        self.single_streams: Dict[str, str] = {}  # Map of connection_id -> stream_name for single-stream (/ws) connections
+        self.dispatch_queues: Dict[str, asyncio.Queue] = {}  # Map of stream_name -> queue of messages for its callback
+        self.dispatch_tasks: Dict[str, asyncio.Task] = {}  # Map of stream_name -> task draining that queue into the callback
+        self.running_tasks: Set[asyncio.Task] = set()  # Set of running tasks
+        self.subscribe_batches: Dict[str, Tuple[List[str], asyncio.Future]] = {}  # Map of connection_id -> (streams, result) awaiting one SUBSCRIBE
+        self._confirm_batches: Set[str] = set()  # Connections whose pending batch should wait for Binance's acknowledgement
+        self.pending_requests: Dict[int, asyncio.Future] = {}  # Map of request id -> future awaiting its response
+        self._request_ids = itertools.count(1)  # Ids for SUBSCRIBE/UNSUBSCRIBE requests
+        self._connect_locks: Dict[str, asyncio.Lock] = {}  # Map of connection_id -> lock so concurrent subscribes open it once
     
     async def connect(self, connection_id: str, base_url: str = MARKET_WS_BASE_URL) -> bool:
         """Establish a WebSocket connection.
@@ -39,9 +131,12 @@ class BinanceWebSocketManager:
             True if connection was successful, False otherwise
         """
         try:
-            connection = await websockets.connect(base_url)
+            connection = await websockets.connect(base_url, **self.CONNECT_OPTIONS)
+            self._tune_socket(connection)
             self.connections[connection_id] = connection
-            logger.info(f"Established WebSocket connection: {connection_id}")
+            self.base_urls[connection_id] = base_url
+            self.is_combined[connection_id] = base_url.endswith("/stream")
+            logger.info("Established WebSocket connection: %s", connection_id)
             
             # Start a task to receive messages
             receive_task = asyncio.create_task(self._receive_messages(connection_id))
@@ -50,9 +145,34 @@ class BinanceWebSocketManager:
             
             return True
         except Exception as e:
-            logger.error(f"Failed to establish WebSocket connection: {e}")
+            logger.error("Failed to establish WebSocket connection: %s", e)
             return False
     
+    def _tune_socket(self, connection):
+        """Set TCP options on a new connection's socket; best effort, as not every transport exposes one."""
+        transport = getattr(connection, "transport", None)
+        sock = transport.get_extra_info("socket") if transport is not None else None
+        if sock is None:
+            return
+        try:
+            # asyncio already enables TCP_NODELAY on TCP transports; set it anyway so it is explicit
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if self.SOCKET_RCVBUF:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.SOCKET_RCVBUF)
+        except OSError as e:
+            logger.debug("Could not tune WebSocket socket: %s", e)
+    
+    async def _ensure_connection(self, connection_id: str, base_url: str) -> bool:
+        """Connect `connection_id` to `base_url` unless it is already open."""
+        # Per connection, so a slow handshake only holds up subscribes waiting for that connection
+        lock = self._connect_locks.get(connection_id)
+        if lock is None:
+            lock = self._connect_locks[connection_id] = asyncio.Lock()
+        async with lock:
+            if connection_id in self.connections:
+                return True
+            return await self.connect(connection_id, base_url)
+    
     async def disconnect(self, connection_id: str) -> bool:
         """Close a WebSocket connection.
         
@@ -62,57 +182,175 @@ class BinanceWebSocketManager:
         Returns:
             True if disconnection was successful, False otherwise
         """
-        if connection_id not in self.connections:
-            logger.warning(f"Connection not found: {connection_id}")
+        # Removed before closing so its receiver knows the close was intended and does not reconnect
+        connection = self.connections.pop(connection_id, None)
+        if connection is None:
+            logger.warning("Connection not found: %s", connection_id)
             return False
         
+        self.base_urls.pop(connection_id, None)
+        self.is_combined.pop(connection_id, None)
+        self.reconnect_attempts.pop(connection_id, None)
+        self.single_streams.pop(connection_id, None)
+        lock = self._connect_locks.get(connection_id)
+        if lock is not None and not lock.locked():
+            del self._connect_locks[connection_id]
+        
+        # Remove any subscriptions using this connection
+        to_remove = []
+        for stream, conn_id in self.subscriptions.items():
+            if conn_id == connection_id:
+                to_remove.append(stream)
+        
+        for stream in to_remove:
+            self._forget_stream(stream)
+        
         try:
-            connection = self.connections[connection_id]
             await connection.close()
-            del self.connections[connection_id]
-            
-            # Remove any subscriptions using this connection
-            to_remove = []
-            for stream, conn_id in self.subscriptions.items():
-                if conn_id == connection_id:
-                    to_remove.append(stream)
-            
-            for stream in to_remove:
-                del self.subscriptions[stream]
-                if stream in self.callbacks:
-                    del self.callbacks[stream]
-            
-            logger.info(f"Closed WebSocket connection: {connection_id}")
+            logger.info("Closed WebSocket connection: %s", connection_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to close WebSocket connection: {e}")
+            logger.error("Failed to close WebSocket connection: %s", e)
             return False
     
+    async def forget(self, stream_name: str):
+        """Drop a stream's subscription state without sending UNSUBSCRIBE, e.g. after a failed subscribe.
+        
+        A single-stream connection opened for the stream is closed as well, so a later
+        subscribe starts clean and a reconnect does not replay the stream.
+        
+        Args:
+            stream_name: Name of the stream to forget
+        """
+        connection_id = self.subscriptions.get(stream_name)
+        if connection_id is not None and self.single_streams.get(connection_id) == stream_name:
+            # Forgets the stream along with its connection
+            await self.disconnect(connection_id)
+        else:
+            self._forget_stream(stream_name)
+    
+    def _forget_stream(self, stream_name: str):
+        """Drop all state for a stream and stop its dispatcher."""
+        self.subscriptions.pop(stream_name, None)
+        self.callbacks.pop(stream_name, None)
+        self.raw_streams.discard(stream_name)
+        self.dispatch_queues.pop(stream_name, None)
+        task = self.dispatch_tasks.pop(stream_name, None)
+        if task is not None:
+            task.cancel()
+    
+    def _start_dispatcher(self, stream_name: str, callback: StreamCallback):
+        """Create the stream's message queue and the worker task that feeds its callback."""
+        task = self.dispatch_tasks.pop(stream_name, None)
+        if task is not None:
+            task.cancel()
+        queue = asyncio.Queue(maxsize=self.DISPATCH_QUEUE_SIZE)
+        self.dispatch_queues[stream_name] = queue
+        self.dispatch_tasks[stream_name] = asyncio.create_task(
+            self._run_dispatcher(stream_name, queue, callback))
+    
+    async def _run_dispatcher(self, stream_name: str, queue: asyncio.Queue, callback: StreamCallback):
+        """Deliver queued messages to a stream's callback, one at a time and in order."""
+        while True:
+            message = await queue.get()
+            try:
+                await callback(message)
+            except Exception as e:
+                logger.error("Error in callback for %s: %s", stream_name, e)
+    
+    def _dispatch(self, stream_name: str, message: Any):
+        """Queue a message for a stream's callback without waiting for the callback to run.
+        
+        Keeps the receive loop reading at socket speed; a slow callback only
+        delays its own stream, and if its queue fills the oldest message is dropped.
+        """
+        queue = self.dispatch_queues.get(stream_name)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            queue.get_nowait()
+            queue.put_nowait(message)
+    
     async def _receive_messages(self, connection_id: str):
         """Background task to receive and process messages for a connection.
         
         Args:
             connection_id: Identifier for the connection to process messages from
         """
-        if connection_id not in self.connections:
-            logger.error(f"Connection not found for receiver: {connection_id}")
+        connection = self.connections.get(connection_id)
+        if connection is None:
+            logger.error("Connection not found for receiver: %s", connection_id)
             return
         
-        connection = self.connections[connection_id]
+        # Bound once; this loop runs for every frame
+        process_message = self._process_message
+        received = False
         
         try:
             async for message in connection:
-                await self._process_message(connection_id, message)
+                await process_message(connection_id, message)
+                if not received:
+                    # The connection is healthy again, so a later drop starts backoff from scratch
+                    received = True
+                    self.reconnect_attempts.pop(connection_id, None)
                 
         except ConnectionClosed:
-            logger.info(f"Connection closed: {connection_id}")
-            # Handle reconnection logic if needed
+            logger.info("Connection closed: %s", connection_id)
         except Exception as e:
-            logger.error(f"Error in message receiver: {e}")
-        finally:
-            # Clean up if the connection was lost unexpectedly
-            if connection_id in self.connections:
-                await self.disconnect(connection_id)
+            logger.error("Error in message receiver: %s", e)
+        
+        # disconnect() already removed the connection if the close was intended
+        if self.connections.get(connection_id) is not connection:
+            return
+        
+        # Otherwise the connection was lost; reconnect, or clean up if that fails
+        if not await self._reconnect(connection_id):
+            await self.disconnect(connection_id)
+    
+    async def _reconnect(self, connection_id: str) -> bool:
+        """Re-open a dropped connection with exponential backoff and replay its subscriptions.
+        
+        Args:
+            connection_id: Identifier for the connection that was lost
+            
+        Returns:
+            True if the connection was re-established, False after max_retries failed attempts
+        """
+        base_url = self.base_urls.get(connection_id)
+        if base_url is None:
+            return False
+        
+        while True:
+            attempt = self.reconnect_attempts.get(connection_id, 0)
+            if attempt >= self.max_retries:
+                logger.error("Giving up on %s after %s reconnection attempts", connection_id, attempt)
+                return False
+            self.reconnect_attempts[connection_id] = attempt + 1
+            
+            delay = min(self.RECONNECT_MAX_DELAY, 0.5 * 2 ** attempt)
+            logger.info("Reconnecting %s in %.1fs (attempt %s/%s)", connection_id, delay,
+                        attempt + 1, self.max_retries)
+            await asyncio.sleep(delay)
+            
+            # Closed with disconnect() while we were waiting
+            if connection_id not in self.connections:
+                return False
+            if await self.connect(connection_id, base_url):
+                break
+        
+        # Single-stream (/ws) URLs carry their stream; combined connections need one SUBSCRIBE for all
+        streams = [stream for stream, conn_id in self.subscriptions.items() if conn_id == connection_id]
+        if streams and self.is_combined.get(connection_id):
+            await self._send_subscribe(connection_id, streams)
+        
+        if self.on_reconnect is not None:
+            try:
+                await self.on_reconnect(connection_id)
+            except Exception as e:
+                logger.error("Error in reconnect hook for %s: %s", connection_id, e)
+        return True
     
     async def _process_message(self, connection_id: str, message: str):
         """Process an incoming WebSocket message.
@@ -122,37 +360,78 @@ class BinanceWebSocketManager:
             message: The raw message string to process
         """
         try:
-            # Parse the message
-            data = json.loads(message)
+            # Single-stream connections carry exactly one stream, found with one dict lookup
+            single_stream = self.single_streams.get(connection_id)
+            
+            # Handle ping/pong frames for connection keep-alive, before raw frames are passed through
+            if message.startswith(_PING_PREFIX if isinstance(message, str) else _PING_PREFIX_BYTES):
+                await self._send_pong(connection_id, orjson.loads(message)["ping"])
+                return
+            
+            # Raw subscribers get the payload text as-is, so skip parsing their frames
+            if self.raw_streams:
+                if single_stream is not None:
+                    frame = (single_stream, message)
+                else:
+                    frame = _split_combined_frame(message)
+                if frame is not None and frame[0] in self.raw_streams:
+                    self._dispatch(frame[0], frame[1])
+                    return
             
-            # Handle ping/pong frames for connection keep-alive
-            if "ping" in data:
-                await self._send_pong(connection_id, data["ping"])
+            # Parse the message (orjson accepts both text and binary frames)
+            data = orjson.loads(message)
+            
+            # Responses to our requests look like {"result": null, "id": 1} or {"error": {...}, "id": 1}
+            if "id" in data and ("result" in data or "error" in data):
+                self._resolve_request(data)
                 return
             
-            # Handle combined stream messages
+            # Handle combined stream messages; the stream's dispatcher calls its callback
             if "stream" in data and "data" in data:
-                stream_name = data["stream"]
-                stream_data = data["data"]
-                
-                # Call the appropriate callback if registered
-                if stream_name in self.callbacks:
-                    callback = self.callbacks[stream_name]
-                    await callback(stream_data)
+                self._dispatch(data["stream"], data["data"])
             
             # Handle single stream messages (raw streams)
-            else:
-                # Try to determine which subscription this is for
-                for stream_name, conn_id in self.subscriptions.items():
-                    if conn_id == connection_id and stream_name in self.callbacks:
-                        callback = self.callbacks[stream_name]
-                        await callback(data)
-                        break
-        
-        except json.JSONDecodeError:
-            logger.error(f"Failed to parse message as JSON: {message[:100]}...")
+            elif single_stream is not None:
+                self._dispatch(single_stream, data)
+        
+        except orjson.JSONDecodeError:
+            logger.error("Failed to parse message as JSON: %s...", message[:100])
+        except Exception as e:
+            logger.error("Error processing message: %s", e)
+    
+    def _resolve_request(self, response: dict):
+        """Complete the future waiting on a SUBSCRIBE/UNSUBSCRIBE response, if any."""
+        future = self.pending_requests.pop(response["id"], None)
+        if future is None or future.done():
+            return
+        if "error" in response:
+            future.set_exception(RuntimeError(f"Binance rejected request {response['id']}: {response['error']}"))
+        else:
+            future.set_result(response["result"])
+    
+    async def _send_request(self, connection, message: str, request_id: int, confirm: bool) -> bool:
+        """Send a request frame and, if `confirm` is set, wait for Binance to acknowledge it.
+        
+        Returns:
+            True if the request was sent (and acknowledged when confirming), False otherwise
+        """
+        future = None
+        if confirm:
+            future = asyncio.get_running_loop().create_future()
+            self.pending_requests[request_id] = future
+        try:
+            await connection.send(message)
+            if future is not None:
+                await asyncio.wait_for(future, self.REQUEST_TIMEOUT)
+            return True
+        except asyncio.TimeoutError:
+            logger.error("No response to request %s within %ss", request_id, self.REQUEST_TIMEOUT)
+            return False
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.error("Request %s failed: %s", request_id, e)
+            return False
+        finally:
+            self.pending_requests.pop(request_id, None)
     
     async def _send_pong(self, connection_id: str, ping_payload: Any):
         """Send a pong response to a ping.
@@ -161,70 +440,157 @@ class BinanceWebSocketManager:
             connection_id: Identifier for the connection to send the pong to
             ping_payload: The payload from the ping message to echo back
         """
-        if connection_id not in self.connections:
+        connection = self.connections.get(connection_id)
+        if connection is None:
             return
         
         try:
-            connection = self.connections[connection_id]
-            pong_message = {"pong": ping_payload}
-            await connection.send(json.dumps(pong_message))
+            try:
+                pong_message = _pong_message(ping_payload)
+            except TypeError:
+                # Unhashable payload (e.g. an object); serialize it directly
+                pong_message = orjson.dumps({"pong": ping_payload}).decode()
+            await connection.send(pong_message)
         except Exception as e:
-            logger.error(f"Error sending pong: {e}")
+            logger.error("Error sending pong: %s", e)
     
     async def subscribe(self, 
                        stream_name: str, 
-                       callback: Callable[[dict], Any], 
+                       callback: StreamCallback, 
                        connection_id: Optional[str] = None,
-                       use_combined_stream: bool = True) -> bool:
+                       use_combined_stream: bool = True,
+                       raw: bool = False,
+                       confirm: bool = False) -> bool:
         """Subscribe to a WebSocket stream.
         
         Args:
             stream_name: Name of the stream to subscribe to (e.g. 'btcusdt@trade')
             callback: Async function to call when a message is received
-            connection_id: Optional identifier for an existing connection to use
+            connection_id: Optional identifier for the connection to use. Combined streams
+                default to the manager's shared connection.
             use_combined_stream: Whether to use the combined stream endpoint
+            raw: Pass the callback the event's JSON text instead of a parsed dict,
+                for consumers that only forward or store messages
+            confirm: Wait for Binance to acknowledge the SUBSCRIBE request (combined streams)
             
         Returns:
             True if subscription was successful, False otherwise
         """
-        # If no connection_id is provided, create a new one
+        # Combined streams are multiplexed over one shared connection by default;
+        # a single-stream connection is dedicated to its stream
         if not connection_id:
-            connection_id = f"conn_{stream_name}_{id(callback)}"
-        
-        # If the connection doesn't exist yet, create it
-        if connection_id not in self.connections:
             if use_combined_stream:
-                base_url = f"{MARKET_WS_BASE_URL}/stream"
+                connection_id = self.SHARED_CONNECTION_ID
             else:
-                base_url = f"{MARKET_WS_BASE_URL}/ws/{stream_name}"
-            
-            connected = await self.connect(connection_id, base_url)
-            if not connected:
-                return False
+                connection_id = f"conn_{stream_name}_{id(callback)}"
+        
+        # If the connection doesn't exist yet, create it
+        if use_combined_stream:
+            base_url = f"{MARKET_WS_BASE_URL}/stream"
+        else:
+            base_url = f"{MARKET_WS_BASE_URL}/ws/{stream_name}"
+        if not await self._ensure_connection(connection_id, base_url):
+            return False
         
         # Register the subscription and callback
         self.subscriptions[stream_name] = connection_id
         self.callbacks[stream_name] = callback
+        self._start_dispatcher(stream_name, callback)
+        if not use_combined_stream:
+            self.single_streams[connection_id] = stream_name
+        if raw:
+            self.raw_streams.add(stream_name)
         
-        # If using a combined stream, send the subscription request
+        # If using a combined stream, send the subscription request (batched with concurrent ones)
         if use_combined_stream:
-            try:
-                connection = self.connections[connection_id]
-                subscribe_msg = {
-                    "method": "SUBSCRIBE",
-                    "params": [stream_name],
-                    "id": id(callback)
-                }
-                await connection.send(json.dumps(subscribe_msg))
-                logger.info(f"Sent subscription request for: {stream_name}")
-                return True
-            except Exception as e:
-                logger.error(f"Failed to send subscription request: {e}")
-                return False
+            return await self._batch_subscribe(connection_id, stream_name, confirm)
         
         # If using a raw stream, the subscription is already active by connecting to the stream URL
         return True
     
+    async def subscribe_many(self,
+                             streams: List[str],
+                             callbacks: List[StreamCallback],
+                             connection_id: Optional[str] = None,
+                             raw: bool = False,
+                             confirm: bool = False) -> bool:
+        """Subscribe to several streams on one combined connection with a single SUBSCRIBE frame.
+        
+        Args:
+            streams: Names of the streams to subscribe to (e.g. ['btcusdt@trade', 'ethusdt@trade'])
+            callbacks: Async functions to call for each stream's messages, in the same order
+            connection_id: Optional identifier for the connection to use (default: the shared one)
+            raw: Pass the callbacks the event's JSON text instead of a parsed dict
+            confirm: Wait for Binance to acknowledge the SUBSCRIBE request
+            
+        Returns:
+            True if subscription was successful, False otherwise
+        """
+        if len(streams) != len(callbacks):
+            raise ValueError("streams and callbacks must have the same length")
+        if not streams:
+            return True
+        
+        if not connection_id:
+            connection_id = self.SHARED_CONNECTION_ID
+        
+        if not await self._ensure_connection(connection_id, f"{MARKET_WS_BASE_URL}/stream"):
+            return False
+        
+        for stream_name, callback in zip(streams, callbacks):
+            self.subscriptions[stream_name] = connection_id
+            self.callbacks[stream_name] = callback
+            self._start_dispatcher(stream_name, callback)
+            if raw:
+                self.raw_streams.add(stream_name)
+        
+        return await self._send_subscribe(connection_id, streams, confirm)
+    
+    async def _batch_subscribe(self, connection_id: str, stream_name: str, confirm: bool) -> bool:
+        """Add a stream to the connection's next SUBSCRIBE frame and wait for it to be sent."""
+        batch = self.subscribe_batches.get(connection_id)
+        if batch is None:
+            batch = self.subscribe_batches[connection_id] = ([], asyncio.get_running_loop().create_future())
+            flush_task = asyncio.create_task(self._flush_subscribe_batch(connection_id, batch))
+            self.running_tasks.add(flush_task)
+            flush_task.add_done_callback(self.running_tasks.discard)
+            flush_task.add_done_callback(functools.partial(self._close_subscribe_batch, connection_id, batch))
+        batch[0].append(stream_name)
+        if confirm:
+            self._confirm_batches.add(connection_id)
+        # Shielded so one cancelled caller does not cancel the result for the rest of the batch
+        return await asyncio.shield(batch[1])
+    
+    async def _flush_subscribe_batch(self, connection_id: str, batch: tuple) -> bool:
+        """Send the streams collected for a connection as one SUBSCRIBE frame."""
+        await asyncio.sleep(self.SUBSCRIBE_BATCH_WINDOW)
+        # Subscribes from here on start the next batch
+        del self.subscribe_batches[connection_id]
+        confirm = connection_id in self._confirm_batches
+        self._confirm_batches.discard(connection_id)
+        ok = False
+        if connection_id in self.connections:
+            ok = await self._send_subscribe(connection_id, batch[0], confirm)
+        batch[1].set_result(ok)
+        return ok
+    
+    def _close_subscribe_batch(self, connection_id: str, batch: tuple, task: asyncio.Task):
+        """Release a batch's subscribers if its flush task was cancelled (e.g. by cleanup())."""
+        if self.subscribe_batches.get(connection_id) is batch:
+            del self.subscribe_batches[connection_id]
+            self._confirm_batches.discard(connection_id)
+        if not batch[1].done():
+            batch[1].set_result(False)
+    
+    async def _send_subscribe(self, connection_id: str, streams: List[str], confirm: bool = False) -> bool:
+        """Send one SUBSCRIBE frame for several streams on a combined connection."""
+        request_id = next(self._request_ids)
+        subscribe_msg = orjson.dumps({"method": "SUBSCRIBE", "params": list(streams), "id": request_id}).decode()
+        if not await self._send_request(self.connections[connection_id], subscribe_msg, request_id, confirm):
+            return False
+        logger.info("Sent subscription request for %s streams", len(streams))
+        return True
+    
     async def unsubscribe(self, stream_name: str) -> bool:
         """Unsubscribe from a WebSocket stream.
         
@@ -234,37 +600,28 @@ class BinanceWebSocketManager:
         Returns:
             True if unsubscription was successful, False otherwise
         """
-        if stream_name not in self.subscriptions:
-            logger.warning(f"No active subscription for: {stream_name}")
+        connection_id = self.subscriptions.get(stream_name)
+        if connection_id is None:
+            logger.warning("No active subscription for: %s", stream_name)
             return False
         
-        connection_id = self.subscriptions[stream_name]
-        
-        # Check if we're using a combined stream
         connection = self.connections.get(connection_id)
         if not connection:
-            logger.warning(f"Connection not found for: {connection_id}")
+            logger.warning("Connection not found for: %s", connection_id)
             return False
         
-        # Check if this is a combined stream by looking at the connection URI
-        if "/stream" in str(connection.uri):
+        # Combined streams are unsubscribed with a control message; single streams own their connection
+        if self.is_combined.get(connection_id):
             try:
-                unsubscribe_msg = {
-                    "method": "UNSUBSCRIBE",
-                    "params": [stream_name],
-                    "id": id(self.callbacks.get(stream_name, lambda: None))
-                }
-                await connection.send(json.dumps(unsubscribe_msg))
+                await connection.send(_unsubscribe_message(stream_name, next(self._request_ids)))
                 
-                # Remove the subscription and callback
-                del self.subscriptions[stream_name]
-                if stream_name in self.callbacks:
-                    del self.callbacks[stream_name]
+                # Remove the subscription, callback and dispatcher
+                self._forget_stream(stream_name)
                 
-                logger.info(f"Unsubscribed from: {stream_name}")
+                logger.info("Unsubscribed from: %s", stream_name)
                 return True
             except Exception as e:
-                logger.error(f"Failed to unsubscribe: {e}")
+                logger.error("Failed to unsubscribe: %s", e)
                 return False
         else:
             # For raw streams, just disconnect the connection
@@ -275,72 +632,77 @@ ws_manager = BinanceWebSocketManager()
 
 # Helper functions for common stream types
 
-async def subscribe_to_trade_stream(symbol: str, callback: Callable[[dict], Any]) -> bool:
+async def subscribe_to_trade_stream(symbol: str, callback: StreamCallback, raw: bool = False) -> bool:
     """Subscribe to the trade stream for a symbol.
     
     Args:
         symbol: Trading pair symbol in lowercase (e.g., 'btcusdt')
         callback: Async function to call when a trade message is received
+        raw: Pass the callback the unparsed JSON text instead of a dict
     
     Returns:
         True if subscription was successful, False otherwise
     """
-    stream_name = f"{symbol.lower()}@trade"
-    return await ws_manager.subscribe(stream_name, callback)
+    stream_name = _stream_name("trade", symbol)
+    return await ws_manager.subscribe(stream_name, callback, raw=raw)
 
-async def subscribe_to_kline_stream(symbol: str, interval: str, callback: Callable[[dict], Any]) -> bool:
+async def subscribe_to_kline_stream(symbol: str, interval: str, callback: StreamCallback, raw: bool = False) -> bool:
     """Subscribe to the kline/candlestick stream for a symbol.
     
     Args:
         symbol: Trading pair symbol in lowercase (e.g., 'btcusdt')
         interval: Kline interval (e.g., '1m', '1h', '1d')
         callback: Async function to call when a kline message is received
+        raw: Pass the callback the unparsed JSON text instead of a dict
     
     Returns:
         True if subscription was successful, False otherwise
     """
-    stream_name = f"{symbol.lower()}@kline_{interval}"
-    return await ws_manager.subscribe(stream_name, callback)
+    stream_name = _stream_name("kline_", symbol, interval)
+    return await ws_manager.subscribe(stream_name, callback, raw=raw)
 
-async def subscribe_to_ticker_stream(symbol: str, callback: Callable[[dict], Any]) -> bool:
+async def subscribe_to_ticker_stream(symbol: str, callback: StreamCallback, raw: bool = False) -> bool:
     """Subscribe to the ticker stream for a symbol.
     
     Args:
         symbol: Trading pair symbol in lowercase (e.g., 'btcusdt')
         callback: Async function to call when a ticker message is received
+        raw: Pass the callback the unparsed JSON text instead of a dict
     
     Returns:
         True if subscription was successful, False otherwise
     """
-    stream_name = f"{symbol.lower()}@ticker"
-    return await ws_manager.subscribe(stream_name, callback)
+    stream_name = _stream_name("ticker", symbol)
+    return await ws_manager.subscribe(stream_name, callback, raw=raw)
 
-async def subscribe_to_book_ticker_stream(symbol: str, callback: Callable[[dict], Any]) -> bool:
+async def subscribe_to_book_ticker_stream(symbol: str, callback: StreamCallback, raw: bool = False) -> bool:
     """Subscribe to the book ticker stream for a symbol.
     
     Args:
         symbol: Trading pair symbol in lowercase (e.g., 'btcusdt')
         callback: Async function to call when a book ticker message is received
+        raw: Pass the callback the unparsed JSON text instead of a dict
     
     Returns:
         True if subscription was successful, False otherwise
     """
-    stream_name = f"{symbol.lower()}@bookTicker"
-    return await ws_manager.subscribe(stream_name, callback)
+    stream_name = _stream_name("bookTicker", symbol)
+    return await ws_manager.subscribe(stream_name, callback, raw=raw)
 
-async def subscribe_to_all_market_tickers(callback: Callable[[dict], Any]) -> bool:
+async def subscribe_to_all_market_tickers(callback: StreamCallback, raw: bool = False) -> bool:
     """Subscribe to ticker streams for all market pairs.
     
     Args:
         callback: Async function to call when market ticker messages are received
+        raw: Pass the callback the unparsed JSON text instead of a dict
     
     Returns:
         True if subscription was successful, False otherwise
     """
     stream_name = "!ticker@arr"
-    return await ws_manager.subscribe(stream_name, callback)
+    return await ws_manager.subscribe(stream_name, callback, raw=raw)
 
-async def subscribe_to_depth_stream(symbol: str, callback: Callable[[dict], Any], levels: Optional[int] = None, update_speed: Optional[int] = None) -> bool:
+async def subscribe_to_depth_stream(symbol: str, callback: StreamCallback, levels: Optional[int] = None, update_speed: Optional[int] = None, raw: bool = False) -> bool:
     """Subscribe to the depth (order book) stream for a symbol.
     
     Args:
@@ -348,25 +710,33 @@ async def subscribe_to_depth_stream(symbol: str, callback: Callable[[dict], Any]
         callback: Async function to call when depth messages are received
         levels: Optional number of levels to include (5, 10, or 20)
         update_speed: Optional update speed in ms (1000 or 100)
+        raw: Pass the callback the unparsed JSON text instead of a dict
         
     Returns:
         True if subscription was successful, False otherwise
     """
-    stream_name = f"{symbol.lower()}@depth"
-    
+    suffix = ""
     if levels:
         if levels not in (5, 10, 20):
-            logger.warning(f"Invalid depth levels: {levels}. Using default.")
+            logger.warning("Invalid depth levels: %s. Using default.", levels)
         else:
-            stream_name = f"{symbol.lower()}@depth{levels}"
+            suffix = str(levels)
     
     if update_speed == 100:
-        stream_name = f"{stream_name}@100ms"
+        suffix = f"{suffix}@100ms"
     
-    return await ws_manager.subscribe(stream_name, callback)
+    stream_name = _stream_name("depth", symbol, suffix)
+    
+    return await ws_manager.subscribe(stream_name, callback, raw=raw)
 
 # Cleanup function for application shutdown
 async def cleanup():
     """Close all WebSocket connections when the application is shutting down."""
     for connection_id in list(ws_manager.connections.keys()):
-        await ws_manager.disconnect(connection_id) 
\ No newline at end of file
+        await ws_manager.disconnect(connection_id)
+    
+    # Receivers stop once their connection closes, but may still be mid-message (or reconnecting)
+    tasks = list(ws_manager.running_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True) 
\ No newline at end of file
@@ -1,57 +1,197 @@
 # commands/market_data.py
+import asyncio
+import functools
+from typing import Union
 from mcp.server.fastmcp import FastMCP
 from binance_mcp_server import binance_api
 
+class _SymbolCoalescer:
+    """Batch per-symbol lookups that arrive close together into one multi-symbol request.
+    
+    Clients often ask for the same statistic for many symbols back to back. Calls made
+    within `window` seconds of each other are collected, and if there are at least
+    `min_batch` distinct symbols they are fetched with one request to the batch endpoint.
+    Smaller groups, and batches Binance rejects (e.g. one invalid symbol), fall back
+    to one request per symbol so each caller gets its own result or error.
+    Symbols already in the cache are answered at once, without waiting for the window.
+    """
+    
+    def __init__(self, fetch_one, fetch_many, cached=None, window: float = 0.02, min_batch: int = 3):
+        """
+        Args:
+            fetch_one: Blocking function taking a symbol and returning its result
+            fetch_many: Blocking function taking a list of symbols and returning {symbol: result}
+            cached: Optional non-blocking function returning a symbol's cached result, or None
+            window: Seconds to wait for more calls before sending the batch
+            min_batch: Fewest distinct symbols worth a batch request
+        """
+        self.fetch_one = fetch_one
+        self.fetch_many = fetch_many
+        self.cached = cached
+        self.window = window
+        self.min_batch = min_batch
+        self._pending = None  # Map of symbol -> future for the batch being collected
+        self._flush_task = None  # Keeps the pending flush from being garbage collected
+    
+    async def get(self, symbol: str):
+        """Return the result for `symbol`, sharing a request with concurrent callers."""
+        if self.cached is not None:
+            result = self.cached(symbol)
+            if result is not None:
+                return result
+        
+        if self._pending is None:
+            self._pending = {}
+            self._flush_task = asyncio.create_task(self._flush(self._pending))
+            self._flush_task.add_done_callback(functools.partial(self._close_batch, self._pending))
+        future = self._pending.get(symbol)
+        if future is None:
+            future = self._pending[symbol] = asyncio.get_running_loop().create_future()
+        # Shielded so one caller being cancelled does not cancel the result for the others
+        return await asyncio.shield(future)
+    
+    async def _flush(self, batch: dict):
+        await asyncio.sleep(self.window)
+        self._pending = None
+        
+        if len(batch) >= self.min_batch:
+            try:
+                results = await binance_api.run_in_thread(self.fetch_many, list(batch))
+            except Exception:
+                # Any batch failure (rejected symbol, network error, bad payload) falls
+                # back to per-symbol requests, which report errors to each caller
+                results = None
+            if results is not None:
+                for symbol, future in batch.items():
+                    if symbol in results:
+                        future.set_result(results[symbol])
+                    else:
+                        future.set_exception(RuntimeError(f"No data returned for symbol: {symbol}"))
+                return
+        
+        async def fetch(symbol, future):
+            try:
+                future.set_result(await binance_api.run_in_thread(self.fetch_one, symbol))
+            except Exception as e:
+                future.set_exception(e)
+        
+        await asyncio.gather(*(fetch(symbol, future) for symbol, future in batch.items()))
+    
+    def _close_batch(self, batch: dict, task: asyncio.Task):
+        """Fail any caller the flush left waiting (e.g. it was cancelled or raised)."""
+        if self._pending is batch:
+            self._pending = None
+        error = None if task.cancelled() else task.exception()
+        for symbol, future in batch.items():
+            if not future.done():
+                future.set_exception(error or RuntimeError(f"Request for {symbol} was not completed"))
+
+_ticker_24hr_batch = _SymbolCoalescer(binance_api.get_24hr_ticker, binance_api.get_24hr_tickers,
+                                      cached=binance_api.get_cached_24hr_ticker)
+_book_ticker_batch = _SymbolCoalescer(binance_api.get_book_ticker, binance_api.get_book_tickers,
+                                      cached=binance_api.get_cached_book_ticker)
+
 def register_market_data_commands(mcp: FastMCP):
-    """Register MCP commands for market data (prices, order books, historical data)."""
+    """Register MCP commands for market data (prices, order books, historical data).
+    
+    Tools are async and run the blocking REST calls in a worker thread so the
+    server's event loop (and any WebSocket streams on it) keeps running, and
+    concurrent tool calls from a client are fetched in parallel.
+    """
     
     @mcp.tool()
-    def ping_binance() -> bool:
+    async def ping_binance() -> bool:
         """Test connectivity to the Binance API server.
         
         Returns:
             True if the server is reachable, otherwise an error is raised.
         """
-        return binance_api.ping()
+        return await binance_api.run_in_thread(binance_api.ping)
     
     @mcp.tool()
-    def get_server_time() -> int:
+    async def get_server_time() -> int:
         """Get the current server time from Binance.
         
         Returns:
             Server time in milliseconds (UNIX timestamp).
         """
-        return binance_api.get_server_time()
+        return await binance_api.run_in_thread(binance_api.get_server_time)
     
     @mcp.tool()
-    def get_price(symbol: str) -> float:
+    async def get_price(symbol: str) -> float:
         """Get the latest trade price for a given symbol (e.g., 'BTCUSDT')."""
-        return binance_api.get_live_price(symbol)
+        return await binance_api.run_in_thread(binance_api.get_live_price, symbol)
     
     @mcp.tool()
-    def get_order_book(symbol: str, depth: int = 10) -> dict:
+    async def get_prices(symbols: list[str]) -> dict:
+        """Get the latest trade prices for several symbols in one request.
+        
+        Args:
+            symbols: Trading pair symbols, e.g., ['BTCUSDT', 'ETHUSDT'].
+        
+        Returns:
+            Dictionary mapping each symbol to its latest price.
+        """
+        return await binance_api.run_in_thread(binance_api.get_live_prices, symbols)
+    
+    @mcp.tool()
+    async def get_order_book(symbol: str, depth: int = 10, columnar: bool = False) -> dict:
         """Retrieve the current order book (top bids/asks) for a symbol.
         
         Args:
             symbol: Trading pair symbol, e.g., 'ETHUSDT'.
             depth: Number of price levels to retrieve for each side (default 10).
+            columnar: If True, return each side as {"price": [...], "qty": [...]}
+                instead of a list of [price, qty] pairs. More compact for deep books.
         """
         # Note: Binance API `limit` parameter accepts specific values (5, 10, 20, 50, 100, 500, etc.)
-        return binance_api.get_order_book(symbol, limit=depth)
+        return await binance_api.run_in_thread(binance_api.get_order_book, symbol, limit=depth, columnar=columnar)
     
     @mcp.tool()
-    def get_historical_prices(symbol: str, interval: str = "1d", limit: int = 100) -> list:
+    async def get_order_books(symbols: list[str], depth: int = 10) -> dict:
+        """Retrieve order books for several symbols at once.
+        
+        Binance has no multi-symbol depth endpoint, so the requests are issued
+        concurrently and complete in roughly the time of the slowest one.
+        
+        Args:
+            symbols: Trading pair symbols, e.g., ['BTCUSDT', 'ETHUSDT']. Duplicates are fetched once.
+            depth: Number of price levels to retrieve for each side (default 10).
+        
+        Returns:
+            Dictionary mapping each symbol to its order book, or to {"error": message}
+            if that symbol could not be fetched.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        books = await asyncio.gather(*(
+            binance_api.run_in_thread(binance_api.get_order_book, symbol, limit=depth) for symbol in symbols
+        ), return_exceptions=True)
+        # One bad symbol reports its own error instead of discarding the books that loaded
+        return {
+            symbol: {"error": str(book)} if isinstance(book, Exception) else book
+            for symbol, book in zip(symbols, books)
+        }
+    
+    @mcp.tool()
+    async def get_historical_prices(symbol: str, interval: str = "1d", limit: int = 100,
+                                    columnar: bool = False, fields: list[str] = None) -> Union[list, dict]:
         """Fetch historical OHLC price data for a symbol.
         
         Args:
             symbol: Trading pair, e.g., 'BTCUSDT'.
             interval: Candlestick interval (e.g., '1m', '15m', '1h', '1d').
             limit: Number of data points to retrieve (max 1000 by Binance API).
+            columnar: If True, return one list per field (open_time, open, high, low, close, volume)
+                instead of one object per candle. Much more compact for large limits.
+            fields: Optional list of fields to return, e.g., ['close']. All of open_time, open,
+                high, low, close and volume are returned if omitted.
         """
-        return binance_api.get_historical_klines(symbol, interval=interval, limit=limit)
+        return await binance_api.run_in_thread(binance_api.get_historical_klines, symbol, interval=interval,
+                                               limit=limit, columnar=columnar, fields=fields)
     
     @mcp.tool()
-    def get_ui_klines(symbol: str, interval: str = "1d", limit: int = 100) -> list:
+    async def get_ui_klines(symbol: str, interval: str = "1d", limit: int = 100,
+                            columnar: bool = False, fields: list[str] = None) -> Union[list, dict]:
         """Fetch UI-optimized candlestick data for a symbol.
         
         This endpoint returns candlestick data optimized for presentation of a candlestick chart.
@@ -60,14 +200,18 @@ def register_market_data_commands(mcp: FastMCP):
             symbol: Trading pair, e.g., 'BTCUSDT'.
             interval: Candlestick interval (e.g., '1m', '15m', '1h', '1d').
             limit: Number of data points to retrieve (max 1000).
+            columnar: If True, return one list per field (open_time, open, high, low, close, volume)
+                instead of one object per candle.
+            fields: Optional list of fields to return, e.g., ['close']. All fields are returned if omitted.
         
         Returns:
             List of candlestick data optimized for UI presentation.
         """
-        return binance_api.get_ui_klines(symbol, interval=interval, limit=limit)
+        return await binance_api.run_in_thread(binance_api.get_ui_klines, symbol, interval=interval,
+                                               limit=limit, columnar=columnar, fields=fields)
     
     @mcp.tool()
-    def get_recent_trades(symbol: str, limit: int = 20) -> list:
+    async def get_recent_trades(symbol: str, limit: int = 20, columnar: bool = False) -> Union[list, dict]:
         """Get recent trades for a symbol.
         
         Retrieves the most recent trades that have occurred for a specific trading pair.
@@ -75,14 +219,15 @@ def register_market_data_commands(mcp: FastMCP):
         Args:
             symbol: Trading pair symbol, e.g., 'BTCUSDT'.
             limit: Number of recent trades to fetch (default: 20, max: 1000).
+            columnar: If True, return one list per field instead of one object per trade.
         
         Returns:
             List of recent trades with details including price, quantity, and timestamp.
         """
-        return binance_api.get_recent_trades(symbol, limit=limit)
+        return await binance_api.run_in_thread(binance_api.get_recent_trades, symbol, limit=limit, columnar=columnar)
     
     @mcp.tool()
-    def get_historical_trades(symbol: str, limit: int = 20, from_id: int = None) -> list:
+    async def get_historical_trades(symbol: str, limit: int = 20, from_id: int = None) -> list:
         """Get historical trades for a symbol.
         
         Retrieves older trades that have occurred for a specific trading pair.
@@ -95,10 +240,10 @@ def register_market_data_commands(mcp: FastMCP):
         Returns:
             List of historical trades with details including price, quantity, and timestamp.
         """
-        return binance_api.get_historical_trades(symbol, limit=limit, from_id=from_id)
+        return await binance_api.run_in_thread(binance_api.get_historical_trades, symbol, limit=limit, from_id=from_id)
     
     @mcp.tool()
-    def get_aggregate_trades(symbol: str, limit: int = 20) -> list:
+    async def get_aggregate_trades(symbol: str, limit: int = 20, columnar: bool = False) -> Union[list, dict]:
         """Get compressed/aggregate trades for a symbol.
         
         Aggregate trades are trades that have been filled at the same time, with the same price from the same order.
@@ -107,14 +252,15 @@ def register_market_data_commands(mcp: FastMCP):
         Args:
             symbol: Trading pair symbol, e.g., 'BTCUSDT'.
             limit: Number of aggregate trades to fetch (default: 20, max: 1000).
+            columnar: If True, return one list per field instead of one object per trade.
         
         Returns:
             List of aggregate trades with details including price, quantity, and timestamp.
         """
-        return binance_api.get_aggregate_trades(symbol, limit=limit)
+        return await binance_api.run_in_thread(binance_api.get_aggregate_trades, symbol, limit=limit, columnar=columnar)
     
     @mcp.tool()
-    def get_24hr_ticker(symbol: str) -> dict:
+    async def get_24hr_ticker(symbol: str, fields: list[str] = None) -> dict:
         """Get 24-hour price change statistics for a symbol.
         
         Provides a comprehensive overview of trading activity for a specific symbol over the past 24 hours,
@@ -122,55 +268,81 @@ def register_market_data_commands(mcp: FastMCP):
         
         Args:
             symbol: Trading pair symbol, e.g., 'BTCUSDT'.
+            fields: Optional list of fields to return, e.g., ['lastPrice', 'priceChangePercent'].
+                All fields are returned if omitted.
         
         Returns:
             Dictionary with 24-hour statistics including price change, volume, and other metrics.
         """
-        return binance_api.get_24hr_ticker(symbol)
+        if fields:
+            return await binance_api.run_in_thread(binance_api.get_24hr_ticker, symbol, fields=fields)
+        # Calls for several symbols in quick succession share one request
+        return await _ticker_24hr_batch.get(symbol)
     
     @mcp.tool()
-    def get_all_24hr_tickers() -> list:
+    async def get_all_24hr_tickers(fields: list[str] = None) -> list:
         """Get 24-hour price change statistics for all symbols.
         
         Provides comprehensive statistics for all trading pairs on the exchange.
-        Note: This can return a large amount of data.
+        Note: This can return a large amount of data; pass `fields` to keep it small.
+        
+        Args:
+            fields: Optional list of fields to return for each symbol, e.g., ['lastPrice', 'volume'].
+                The symbol is always included. All fields are returned if omitted.
         
         Returns:
             List of dictionaries, each containing 24-hour statistics for a trading pair.
         """
-        return binance_api.get_24hr_ticker()
+        return await binance_api.run_in_thread(binance_api.get_24hr_ticker, fields=fields)
+    
+    @mcp.tool()
+    async def get_24hr_tickers(symbols: list[str]) -> dict:
+        """Get 24-hour price change statistics for several symbols in one request.
+        
+        Much cheaper than calling get_24hr_ticker once per symbol, and than
+        fetching all symbols when only a few are needed.
+        
+        Args:
+            symbols: Trading pair symbols, e.g., ['BTCUSDT', 'ETHUSDT'].
+        
+        Returns:
+            Dictionary mapping each symbol to its 24-hour statistics.
+        """
+        return await binance_api.run_in_thread(binance_api.get_24hr_tickers, symbols)
     
     @mcp.tool()
-    def get_trading_day_ticker(symbol: str, type: str = "FULL") -> dict:
+    async def get_trading_day_ticker(symbol: str, type: str = "MINI") -> dict:
         """Get trading day price change statistics for a symbol.
         
         Provides statistics for the current trading day (rather than a rolling 24-hour period).
         
         Args:
             symbol: Trading pair symbol, e.g., 'BTCUSDT'.
-            type: Response type ('FULL' or 'MINI'). FULL includes all fields, MINI includes fewer fields.
+            type: Response type ('MINI' or 'FULL'). MINI (the default) has open/high/low/last price
+                and volumes; FULL adds price change, weighted average price and more.
             
         Returns:
             Dictionary with trading day statistics including price change, volume, and other metrics.
         """
-        return binance_api.get_trading_day_ticker(symbol, type=type)
+        return await binance_api.run_in_thread(binance_api.get_trading_day_ticker, symbol, type=type)
     
     @mcp.tool()
-    def get_all_trading_day_tickers(type: str = "FULL") -> list:
+    async def get_all_trading_day_tickers(type: str = "MINI") -> list:
         """Get trading day price change statistics for all symbols.
         
         Provides statistics for the current trading day for all trading pairs.
         
         Args:
-            type: Response type ('FULL' or 'MINI'). FULL includes all fields, MINI includes fewer fields.
+            type: Response type ('MINI' or 'FULL'). MINI (the default) has open/high/low/last price
+                and volumes; FULL adds price change, weighted average price and more.
             
         Returns:
             List of dictionaries with trading day statistics for all trading pairs.
         """
-        return binance_api.get_trading_day_ticker(type=type)
+        return await binance_api.run_in_thread(binance_api.get_trading_day_ticker, type=type)
     
     @mcp.tool()
-    def get_rolling_window_ticker(symbol: str, window_size: str = "1d", type: str = "FULL") -> dict:
+    async def get_rolling_window_ticker(symbol: str, window_size: str = "1d", type: str = "MINI") -> dict:
         """Get rolling window price change statistics for a symbol.
         
         Provides statistics for a specified rolling window period.
@@ -178,30 +350,33 @@ def register_market_data_commands(mcp: FastMCP):
         Args:
             symbol: Trading pair symbol, e.g., 'BTCUSDT'.
             window_size: Size of the rolling window (e.g., '1d', '4h').
-            type: Response type ('FULL' or 'MINI'). FULL includes all fields, MINI includes fewer fields.
+            type: Response type ('MINI' or 'FULL'). MINI (the default) has open/high/low/last price
+                and volumes; FULL adds price change, weighted average price and more.
             
         Returns:
             Dictionary with rolling window statistics including price change, volume, and other metrics.
         """
-        return binance_api.get_rolling_window_ticker(symbol, windowSize=window_size, type=type)
+        return await binance_api.run_in_thread(binance_api.get_rolling_window_ticker, symbol,
+                                               windowSize=window_size, type=type)
     
     @mcp.tool()
-    def get_all_rolling_window_tickers(window_size: str = "1d", type: str = "FULL") -> list:
+    async def get_all_rolling_window_tickers(window_size: str = "1d", type: str = "MINI") -> list:
         """Get rolling window price change statistics for all symbols.
         
         Provides statistics for a specified rolling window period for all trading pairs.
         
         Args:
             window_size: Size of the rolling window (e.g., '1d', '4h').
-            type: Response type ('FULL' or 'MINI'). FULL includes all fields, MINI includes fewer fields.
+            type: Response type ('MINI' or 'FULL'). MINI (the default) has open/high/low/last price
+                and volumes; FULL adds price change, weighted average price and more.
             
         Returns:
             List of dictionaries with rolling window statistics for all trading pairs.
         """
-        return binance_api.get_rolling_window_ticker(windowSize=window_size, type=type)
+        return await binance_api.run_in_thread(binance_api.get_rolling_window_ticker, windowSize=window_size, type=type)
     
     @mcp.tool()
-    def get_average_price(symbol: str) -> float:
+    async def get_average_price(symbol: str) -> float:
         """Get the current average price for a symbol.
         
         The average price is calculated using a weighted average of trades in the last 5 minutes.
@@ -212,10 +387,10 @@ def register_market_data_commands(mcp: FastMCP):
         Returns:
             Current average price as a float.
         """
-        return binance_api.get_average_price(symbol)
+        return await binance_api.run_in_thread(binance_api.get_average_price, symbol)
     
     @mcp.tool()
-    def get_book_ticker(symbol: str) -> dict:
+    async def get_book_ticker(symbol: str) -> dict:
         """Get the best price/quantity on the order book for a symbol.
         
         Retrieves the best (top) bid and ask price and quantity on the order book.
@@ -227,10 +402,11 @@ def register_market_data_commands(mcp: FastMCP):
         Returns:
             Dictionary containing the best bid and ask prices and quantities.
         """
-        return binance_api.get_book_ticker(symbol)
+        # Calls for several symbols in quick succession share one request
+        return await _book_ticker_batch.get(symbol)
     
     @mcp.tool()
-    def get_all_book_tickers() -> list:
+    async def get_all_book_tickers() -> list:
         """Get the best price/quantity on the order book for all symbols.
         
         Retrieves the best bid and ask for all trading pairs in a single request.
@@ -238,4 +414,4 @@ def register_market_data_commands(mcp: FastMCP):
         Returns:
             List of dictionaries, each containing the best bid and ask for a symbol.
         """
-        return binance_api.get_book_ticker() 
\ No newline at end of file
+        return await binance_api.run_in_thread(binance_api.get_book_ticker)
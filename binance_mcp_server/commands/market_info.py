@@ -3,17 +3,22 @@ from mcp.server.fastmcp import FastMCP
 from binance_mcp_server import binance_api
 
 def register_market_info_commands(mcp: FastMCP):
-    """Register MCP commands for exchange information and metadata."""
+    """Register MCP commands for exchange information and metadata.
+    
+    Tools are async and run the blocking REST calls in a worker thread so the
+    server's event loop (and any WebSocket streams on it) keeps running.
+    """
     
     @mcp.tool()
-    def get_exchange_info() -> dict:
+    async def get_exchange_info() -> dict:
         """Get Binance exchange information, including supported symbols and trading rules."""
-        return binance_api.get_exchange_info()
+        return await binance_api.run_in_thread(binance_api.get_exchange_info)
     
     @mcp.tool()
-    def get_trading_fees() -> dict:
+    async def get_trading_fees() -> dict:
         """Get the current trading fee rates (maker/taker) on Binance.
         
         Note: This uses default public fee rates. Actual user-specific fees would require API keys.
         """
+        # Static values, no network call, so there is nothing to offload to a thread
         return binance_api.get_trading_fees() 
\ No newline at end of file
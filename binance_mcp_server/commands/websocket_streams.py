@@ -1,35 +1,110 @@
 # commands/websocket_streams.py
 import asyncio
+import functools
 import json
-from typing import Dict, List, Any, Optional
-import threading
-from queue import Queue
+import logging
+from collections import deque
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Set
+import orjson
 from mcp.server.fastmcp import FastMCP
-from binance_mcp_server import binance_ws_api
+from binance_mcp_server import binance_api, binance_ws_api
 
-# Global state to store active subscriptions and their data
-active_subscriptions = {}
-subscription_data = {}
-data_queues = {}
+logger = logging.getLogger(__name__)
+
+# Messages kept per stream for get_stream_history; older ones are dropped
+STREAM_HISTORY_SIZE = 256
+
+class StreamState:
+    """Everything kept for one subscribed stream, stored under its name in `_streams`."""
+    __slots__ = ("meta", "history")
+    
+    def __init__(self, meta: dict):
+        self.meta = meta  # Subscription details (type, symbol, ...) shown by list_active_subscriptions
+        self.history = deque(maxlen=STREAM_HISTORY_SIZE)  # Recent messages, newest last
+
+# Global state: stream_name -> StreamState for every active (or pending) subscription
+_streams: Dict[str, StreamState] = {}
+
+# Subscribe/unsubscribe requests allowed in flight at once, so a client subscribing to
+# hundreds of symbols sends them in controlled batches instead of all at the same time
+_MAX_CONCURRENT_SUBSCRIPTIONS = 20
+_subscription_slots = asyncio.Semaphore(_MAX_CONCURRENT_SUBSCRIPTIONS)
+
+async def _limited(coro):
+    """Run a subscribe/unsubscribe coroutine once a subscription slot is free."""
+    async with _subscription_slots:
+        return await coro
+
+# The event loop only keeps weak references to tasks, so background work started by
+# the tools is held here until it finishes
+_background_tasks: Set[asyncio.Task] = set()
+
+def _run_in_background(coro):
+    """Start a coroutine as a task that stays referenced until done and logs its failure."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_task_done)
+
+def _background_task_done(task: asyncio.Task):
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background stream task failed", exc_info=task.exception())
 
 # Function to handle incoming WebSocket messages
 async def handle_stream_message(stream_name: str, message: dict):
-    """Process incoming WebSocket message and store it in the subscription data."""
-    global subscription_data
+    """Process incoming WebSocket message and store it in the stream's state."""
+    state = _streams.get(stream_name)
+    if state is not None:
+        # A bounded deque drops the oldest message itself once full
+        state.history.append(message)
+
+def _ensure_subscribed(stream_name: str, meta: dict,
+                       subscribe: Callable[[Callable], Awaitable[bool]], description: str) -> dict:
+    """Start subscribing to a stream in the background unless it is already subscribed.
     
-    # Store the latest message for this stream
-    subscription_data[stream_name] = message
+    Args:
+        stream_name: Name of the stream (e.g., 'btcusdt@trade')
+        meta: Subscription details reported by list_active_subscriptions
+        subscribe: Async function that subscribes the given callback to the stream
+            and returns True on success
+        description: What the stream is, for status messages (e.g., 'trade stream for btcusdt')
     
-    # If there's a queue for this stream, add the message to it
-    if stream_name in data_queues:
-        # Add to the queue, but don't block if it's full (discard oldest)
-        queue = data_queues[stream_name]
-        if queue.full():
-            try:
-                queue.get_nowait()  # Remove oldest item
-            except:
-                pass
-        queue.put(message)
+    Returns:
+        Dictionary with subscription status and information.
+    """
+    # Check if already subscribed
+    if stream_name in _streams:
+        return {
+            "status": "already_subscribed",
+            "stream": stream_name,
+            "message": f"Already subscribed to {description}"
+        }
+    
+    # Track the stream's details and the messages it delivers
+    _streams[stream_name] = StreamState(meta)
+    
+    # Run the subscription in a background task
+    async def subscribe_task():
+        success = False
+        try:
+            success = await subscribe(functools.partial(handle_stream_message, stream_name))
+        finally:
+            # Also on errors, so the stream is not left looking "pending" forever
+            if not success:
+                _streams.pop(stream_name, None)
+                # The manager may have registered the stream before failing; drop that too
+                try:
+                    await binance_ws_api.ws_manager.forget(stream_name)
+                except Exception as e:
+                    logger.error("Failed to clean up stream %s: %s", stream_name, e)
+    
+    _run_in_background(_limited(subscribe_task()))
+    
+    return {
+        "status": "subscribing",
+        "stream": stream_name,
+        "message": f"Subscribing to {description}"
+    }
 
 def register_websocket_commands(mcp: FastMCP):
     """Register MCP commands for WebSocket stream interactions."""
@@ -47,40 +122,12 @@ def register_websocket_commands(mcp: FastMCP):
             Dictionary with subscription status and information.
         """
         symbol = symbol.lower()
-        stream_name = f"{symbol}@trade"
-        
-        # Check if already subscribed
-        if stream_name in active_subscriptions:
-            return {
-                "status": "already_subscribed",
-                "stream": stream_name,
-                "message": f"Already subscribed to trade stream for {symbol}"
-            }
-        
-        # Create a queue for this stream's data
-        data_queues[stream_name] = Queue(maxsize=100)
-        
-        # Set up callback function
-        async def callback(data):
-            await handle_stream_message(stream_name, data)
-        
-        # Run the subscription in a background task
-        async def subscribe_task():
-            success = await binance_ws_api.subscribe_to_trade_stream(symbol, callback)
-            if success:
-                active_subscriptions[stream_name] = {
-                    "type": "trade",
-                    "symbol": symbol
-                }
-        
-        # Use create_task for async operations
-        asyncio.create_task(subscribe_task())
-        
-        return {
-            "status": "subscribing",
-            "stream": stream_name,
-            "message": f"Subscribing to trade stream for {symbol}"
-        }
+        return _ensure_subscribed(
+            f"{symbol}@trade",
+            {"type": "trade", "symbol": symbol},
+            lambda callback: binance_ws_api.subscribe_to_trade_stream(symbol, callback),
+            f"trade stream for {symbol}",
+        )
     
     @mcp.tool()
     def subscribe_to_kline_stream(symbol: str, interval: str = "1m") -> dict:
@@ -96,41 +143,12 @@ def register_websocket_commands(mcp: FastMCP):
             Dictionary with subscription status and information.
         """
         symbol = symbol.lower()
-        stream_name = f"{symbol}@kline_{interval}"
-        
-        # Check if already subscribed
-        if stream_name in active_subscriptions:
-            return {
-                "status": "already_subscribed",
-                "stream": stream_name,
-                "message": f"Already subscribed to kline stream for {symbol} with interval {interval}"
-            }
-        
-        # Create a queue for this stream's data
-        data_queues[stream_name] = Queue(maxsize=100)
-        
-        # Set up callback function
-        async def callback(data):
-            await handle_stream_message(stream_name, data)
-        
-        # Run the subscription in a background task
-        async def subscribe_task():
-            success = await binance_ws_api.subscribe_to_kline_stream(symbol, interval, callback)
-            if success:
-                active_subscriptions[stream_name] = {
-                    "type": "kline",
-                    "symbol": symbol,
-                    "interval": interval
-                }
-        
-        # Use create_task for async operations
-        asyncio.create_task(subscribe_task())
-        
-        return {
-            "status": "subscribing",
-            "stream": stream_name,
-            "message": f"Subscribing to kline stream for {symbol} with interval {interval}"
-        }
+        return _ensure_subscribed(
+            f"{symbol}@kline_{interval}",
+            {"type": "kline", "symbol": symbol, "interval": interval},
+            lambda callback: binance_ws_api.subscribe_to_kline_stream(symbol, interval, callback),
+            f"kline stream for {symbol} with interval {interval}",
+        )
     
     @mcp.tool()
     def subscribe_to_ticker_stream(symbol: str) -> dict:
@@ -145,40 +163,12 @@ def register_websocket_commands(mcp: FastMCP):
             Dictionary with subscription status and information.
         """
         symbol = symbol.lower()
-        stream_name = f"{symbol}@ticker"
-        
-        # Check if already subscribed
-        if stream_name in active_subscriptions:
-            return {
-                "status": "already_subscribed",
-                "stream": stream_name,
-                "message": f"Already subscribed to ticker stream for {symbol}"
-            }
-        
-        # Create a queue for this stream's data
-        data_queues[stream_name] = Queue(maxsize=100)
-        
-        # Set up callback function
-        async def callback(data):
-            await handle_stream_message(stream_name, data)
-        
-        # Run the subscription in a background task
-        async def subscribe_task():
-            success = await binance_ws_api.subscribe_to_ticker_stream(symbol, callback)
-            if success:
-                active_subscriptions[stream_name] = {
-                    "type": "ticker",
-                    "symbol": symbol
-                }
-        
-        # Use create_task for async operations
-        asyncio.create_task(subscribe_task())
-        
-        return {
-            "status": "subscribing",
-            "stream": stream_name,
-            "message": f"Subscribing to ticker stream for {symbol}"
-        }
+        return _ensure_subscribed(
+            f"{symbol}@ticker",
+            {"type": "ticker", "symbol": symbol},
+            lambda callback: binance_ws_api.subscribe_to_ticker_stream(symbol, callback),
+            f"ticker stream for {symbol}",
+        )
     
     @mcp.tool()
     def subscribe_to_book_ticker_stream(symbol: str) -> dict:
@@ -193,40 +183,12 @@ def register_websocket_commands(mcp: FastMCP):
             Dictionary with subscription status and information.
         """
         symbol = symbol.lower()
-        stream_name = f"{symbol}@bookTicker"
-        
-        # Check if already subscribed
-        if stream_name in active_subscriptions:
-            return {
-                "status": "already_subscribed",
-                "stream": stream_name,
-                "message": f"Already subscribed to book ticker stream for {symbol}"
-            }
-        
-        # Create a queue for this stream's data
-        data_queues[stream_name] = Queue(maxsize=100)
-        
-        # Set up callback function
-        async def callback(data):
-            await handle_stream_message(stream_name, data)
-        
-        # Run the subscription in a background task
-        async def subscribe_task():
-            success = await binance_ws_api.subscribe_to_book_ticker_stream(symbol, callback)
-            if success:
-                active_subscriptions[stream_name] = {
-                    "type": "bookTicker",
-                    "symbol": symbol
-                }
-        
-        # Use create_task for async operations
-        asyncio.create_task(subscribe_task())
-        
-        return {
-            "status": "subscribing",
-            "stream": stream_name,
-            "message": f"Subscribing to book ticker stream for {symbol}"
-        }
+        return _ensure_subscribed(
+            f"{symbol}@bookTicker",
+            {"type": "bookTicker", "symbol": symbol},
+            lambda callback: binance_ws_api.subscribe_to_book_ticker_stream(symbol, callback),
+            f"book ticker stream for {symbol}",
+        )
     
     @mcp.tool()
     def subscribe_to_depth_stream(symbol: str, levels: int = 10) -> dict:
@@ -250,41 +212,12 @@ def register_websocket_commands(mcp: FastMCP):
                 "message": f"Invalid depth levels: {levels}. Must be 5, 10, or 20."
             }
         
-        stream_name = f"{symbol}@depth{levels}"
-        
-        # Check if already subscribed
-        if stream_name in active_subscriptions:
-            return {
-                "status": "already_subscribed",
-                "stream": stream_name,
-                "message": f"Already subscribed to depth stream for {symbol} with {levels} levels"
-            }
-        
-        # Create a queue for this stream's data
-        data_queues[stream_name] = Queue(maxsize=100)
-        
-        # Set up callback function
-        async def callback(data):
-            await handle_stream_message(stream_name, data)
-        
-        # Run the subscription in a background task
-        async def subscribe_task():
-            success = await binance_ws_api.subscribe_to_depth_stream(symbol, callback, levels)
-            if success:
-                active_subscriptions[stream_name] = {
-                    "type": "depth",
-                    "symbol": symbol,
-                    "levels": levels
-                }
-        
-        # Use create_task for async operations
-        asyncio.create_task(subscribe_task())
-        
-        return {
-            "status": "subscribing",
-            "stream": stream_name,
-            "message": f"Subscribing to depth stream for {symbol} with {levels} levels"
-        }
+        return _ensure_subscribed(
+            f"{symbol}@depth{levels}",
+            {"type": "depth", "symbol": symbol, "levels": levels},
+            lambda callback: binance_ws_api.subscribe_to_depth_stream(symbol, callback, levels),
+            f"depth stream for {symbol} with {levels} levels",
+        )
     
     @mcp.tool()
     def list_active_subscriptions() -> dict:
@@ -296,8 +229,8 @@ def register_websocket_commands(mcp: FastMCP):
             Dictionary with the list of active subscriptions and their details.
         """
         return {
-            "active_subscriptions": active_subscriptions,
-            "count": len(active_subscriptions)
+            "active_subscriptions": {name: state.meta for name, state in _streams.items()},
+            "count": len(_streams)
         }
     
     @mcp.tool()
@@ -310,22 +243,101 @@ def register_websocket_commands(mcp: FastMCP):
         Returns:
             Dictionary with the latest data received from the stream.
         """
-        if stream_name not in active_subscriptions:
+        state = _streams.get(stream_name)
+        if state is None:
+            return {
+                "status": "error",
+                "message": f"No active subscription for stream: {stream_name}"
+            }
+        
+        if not state.history:
+            return {
+                "status": "pending",
+                "message": f"Subscription active but no data received yet for: {stream_name}"
+            }
+        
+        return {
+            "status": "success",
+            "stream": stream_name,
+            "data": state.history[-1]
+        }
+    
+    @mcp.tool()
+    def get_stream_history(stream_name: str, limit: int = 50) -> dict:
+        """Get the most recent messages received from a WebSocket stream.
+        
+        Args:
+            stream_name: Name of the stream (e.g., 'btcusdt@trade')
+            limit: Maximum number of messages to return, oldest first (default 50, up to 256).
+            
+        Returns:
+            Dictionary with the recent messages received from the stream.
+        """
+        state = _streams.get(stream_name)
+        if state is None:
             return {
                 "status": "error",
                 "message": f"No active subscription for stream: {stream_name}"
             }
         
-        if stream_name not in subscription_data:
+        return {
+            "status": "success",
+            "stream": stream_name,
+            "data": list(state.history)[-limit:] if limit > 0 else []
+        }
+    
+    @mcp.tool()
+    def get_depth_mid(stream_name: str) -> dict:
+        """Get the best bid, best ask, mid price and spread from a depth stream's latest update.
+        
+        Args:
+            stream_name: Name of a partial depth stream (e.g., 'btcusdt@depth10')
+            
+        Returns:
+            Dictionary with the best bid/ask prices, their midpoint and the spread.
+        """
+        state = _streams.get(stream_name)
+        if state is None:
+            return {
+                "status": "error",
+                "message": f"No active subscription for stream: {stream_name}"
+            }
+        
+        if not state.history:
             return {
                 "status": "pending",
                 "message": f"Subscription active but no data received yet for: {stream_name}"
             }
         
+        # Only the top level is converted, on request, rather than every level of every update
+        latest = state.history[-1]
+        if not isinstance(latest, dict):
+            # Streams subscribed raw keep the event's JSON text
+            try:
+                latest = orjson.loads(latest)
+            except orjson.JSONDecodeError:
+                latest = None
+        if not isinstance(latest, dict):
+            return {
+                "status": "error",
+                "message": f"Latest update on {stream_name} is not a JSON object"
+            }
+        bids, asks = latest.get("bids"), latest.get("asks")
+        if not bids or not asks:
+            return {
+                "status": "error",
+                "message": f"Latest update on {stream_name} has no bids/asks; is it a depth stream?"
+            }
+        
+        best_bid = float(bids[0][0])
+        best_ask = float(asks[0][0])
         return {
             "status": "success",
             "stream": stream_name,
-            "data": subscription_data[stream_name]
+            "best_bid": best_bid,
+            "best_ask": best_ask,
+            "mid": (best_bid + best_ask) / 2,
+            "spread": best_ask - best_bid
         }
     
     @mcp.tool()
@@ -338,7 +350,7 @@ def register_websocket_commands(mcp: FastMCP):
         Returns:
             Dictionary with the unsubscription status.
         """
-        if stream_name not in active_subscriptions:
+        if stream_name not in _streams:
             return {
                 "status": "error",
                 "message": f"No active subscription for stream: {stream_name}"
@@ -349,15 +361,9 @@ def register_websocket_commands(mcp: FastMCP):
             success = await binance_ws_api.ws_manager.unsubscribe(stream_name)
             if success:
                 # Clean up references
-                if stream_name in active_subscriptions:
-                    del active_subscriptions[stream_name]
-                if stream_name in subscription_data:
-                    del subscription_data[stream_name]
-                if stream_name in data_queues:
-                    del data_queues[stream_name]
+                _streams.pop(stream_name, None)
         
-        # Use create_task for async operations
-        asyncio.create_task(unsubscribe_task())
+        _run_in_background(_limited(unsubscribe_task()))
         
         return {
             "status": "unsubscribing",
@@ -369,6 +375,8 @@ def register_websocket_commands(mcp: FastMCP):
     def cleanup_all_streams() -> dict:
         """Close all active WebSocket connections and clean up resources.
         
+        Cached REST responses are dropped as well, so later calls start from fresh data.
+        
         Returns:
             Dictionary with the cleanup status.
         """
@@ -377,12 +385,10 @@ def register_websocket_commands(mcp: FastMCP):
             await binance_ws_api.cleanup()
             
             # Clear all references
-            active_subscriptions.clear()
-            subscription_data.clear()
-            data_queues.clear()
+            _streams.clear()
+            binance_api.clear_cache()
         
-        # Use create_task for async operations
-        asyncio.create_task(cleanup_task())
+        _run_in_background(cleanup_task())
         
         return {
             "status": "cleaning_up",
@@ -5,7 +5,7 @@ from binance_mcp_server.commands import market_data, market_info, websocket_stre
 
 # 1. Create the MCP server instance with a descriptive name.
 # You can also specify dependencies that the server requires at runtime.
-mcp = FastMCP("BinanceMarketData", dependencies=["requests", "websockets"])
+mcp = FastMCP("BinanceMarketData", dependencies=["requests", "orjson", "websockets"])
 
 # 2. Register commands from the command modules.
 market_data.register_market_data_commands(mcp)
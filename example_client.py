@@ -5,21 +5,37 @@ This demonstrates how to connect to the server and use its tools programmaticall
 """
 
 import asyncio
+import os
 import subprocess
 import sys
 from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
 
-async def main():
+def connect_to_server():
+    """Connect to an already running server if BINANCE_MCP_ENDPOINT is set, else start one.
+    
+    Starting the server means a fresh interpreter importing the whole package on every
+    run; a server started with BINANCE_MCP_TRANSPORT=sse pays that once.
+    
+    Returns:
+        Async context manager yielding the (read, write) streams for a ClientSession.
+    """
+    endpoint = os.getenv("BINANCE_MCP_ENDPOINT")  # e.g. http://127.0.0.1:8000/sse
+    if endpoint:
+        return sse_client(endpoint)
+    
     # Create server parameters for stdio connection
     server_params = StdioServerParameters(
         command=sys.executable,  # Current Python executable
         args=["run_server.py"],  # Run the server script
     )
+    return stdio_client(server_params)
 
+async def main():
     # Connect to the server
     print("Connecting to Binance MCP Server...")
-    async with stdio_client(server_params) as (read, write):
+    async with connect_to_server() as (read, write):
         async with ClientSession(read, write) as session:
             # Initialize the connection
             await session.initialize()
@@ -38,62 +54,54 @@ async def main():
                     # If tool is an object with attributes
                     print(f"- {tool.name}: {tool.description}")
             
-            # Fetch BTC price
-            print("\nFetching BTC price...")
-            btc_price_result = await session.call_tool("get_price", arguments={"symbol": "BTCUSDT"})
-            # Extract the actual result value
-            btc_price = getattr(btc_price_result, "result", btc_price_result)
-            print(f"Current BTC price: ${btc_price}")
-            
-            # Fetch ETH order book
-            print("\nFetching ETH order book (top 5 levels)...")
-            eth_orderbook_result = await session.call_tool(
-                "get_order_book", 
-                arguments={"symbol": "ETHUSDT", "depth": 5}
+            # The calls below don't depend on each other, so issue them together over the
+            # one session; the server runs them concurrently and the wait is the slowest one
+            print("\nFetching BTC price, ETH order book, BTC history and trading fees...")
+            btc_price_result, eth_orderbook_result, btc_history_result, fees_result = await asyncio.gather(
+                session.call_tool("get_price", arguments={"symbol": "BTCUSDT"}),
+                session.call_tool("get_order_book", arguments={"symbol": "ETHUSDT", "depth": 5}),
+                session.call_tool("get_historical_prices", arguments={"symbol": "BTCUSDT", "interval": "1d", "limit": 3,
+                                                                     "fields": ["open_time", "close"]}),
+                session.call_tool("get_trading_fees"),
             )
-            # Extract the actual result value
+            
+            # Extract the actual result values
+            btc_price = getattr(btc_price_result, "result", btc_price_result)
             eth_orderbook = getattr(eth_orderbook_result, "result", eth_orderbook_result)
+            btc_history = getattr(btc_history_result, "result", btc_history_result)
+            fees = getattr(fees_result, "result", fees_result)
+            
+            print(f"\nCurrent BTC price: ${btc_price}")
             
-            print("ETH Order Book:")
+            print("\nETH Order Book (top 5 levels):")
+            # depth=5 was requested, so the book already holds just the top 5 levels
+            bids = eth_orderbook.get("bids") if isinstance(eth_orderbook, dict) else None
+            asks = eth_orderbook.get("asks") if isinstance(eth_orderbook, dict) else None
             print("Bids (buy orders):")
-            if isinstance(eth_orderbook, dict) and "bids" in eth_orderbook:
-                for bid in eth_orderbook["bids"][:5]:
+            if bids is not None:
+                for bid in bids:
                     print(f"  Price: ${bid[0]}, Quantity: {bid[1]}")
             else:
                 print(f"  Unexpected result format: {eth_orderbook}")
                 
             print("Asks (sell orders):")
-            if isinstance(eth_orderbook, dict) and "asks" in eth_orderbook:
-                for ask in eth_orderbook["asks"][:5]:
+            if asks is not None:
+                for ask in asks:
                     print(f"  Price: ${ask[0]}, Quantity: {ask[1]}")
             else:
                 print(f"  Unexpected result format: {eth_orderbook}")
             
-            # Fetch BTC historical prices
-            print("\nFetching BTC historical prices (last 3 days)...")
-            btc_history_result = await session.call_tool(
-                "get_historical_prices", 
-                arguments={"symbol": "BTCUSDT", "interval": "1d", "limit": 3}
-            )
-            # Extract the actual result value
-            btc_history = getattr(btc_history_result, "result", btc_history_result)
-            
-            print("BTC Historical Prices (last 3 days):")
+            print("\nBTC Closing Prices (last 3 days):")
             if isinstance(btc_history, list):
                 for candle in btc_history:
                     if isinstance(candle, dict):
-                        print(f"  Open: ${candle.get('open')}, High: ${candle.get('high')}, Low: ${candle.get('low')}, Close: ${candle.get('close')}, Volume: {candle.get('volume')}")
+                        print(f"  Open time: {candle.get('open_time')}, Close: ${candle.get('close')}")
                     else:
                         print(f"  Unexpected candle format: {candle}")
             else:
                 print(f"  Unexpected result format: {btc_history}")
             
-            # Get trading fees
-            print("\nFetching trading fees...")
-            fees_result = await session.call_tool("get_trading_fees")
-            # Extract the actual result value
-            fees = getattr(fees_result, "result", fees_result)
-            
+            print("\nTrading fees:")
             if isinstance(fees, dict) and "maker_fee" in fees and "taker_fee" in fees:
                 print(f"Maker fee: {fees['maker_fee']*100}%")
                 print(f"Taker fee: {fees['taker_fee']*100}%")
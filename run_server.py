@@ -4,9 +4,25 @@ Run script for the Binance MCP Server.
 This script makes it easier to run the server from the command line.
 """
 
+import asyncio
+import logging
+import os
 from binance_mcp_server.server import mcp
 
+def install_uvloop() -> bool:
+    """Use uvloop for the server's event loop when it is installed (optional speedup)."""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
 if __name__ == "__main__":
+    # Log to stderr; stdout carries the MCP protocol when running over STDIO
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     print("Starting Binance MCP Server...")
-    mcp.run()
+    install_uvloop()
+    # BINANCE_MCP_TRANSPORT=sse keeps one long-lived server that clients connect to over HTTP
+    mcp.run(transport=os.getenv("BINANCE_MCP_TRANSPORT", "stdio"))
     print("Binance MCP Server stopped.") 
\ No newline at end of file
@@ -7,17 +7,29 @@ setup(
     description="MCP server for accessing Binance data",
     author="Your Name",
     author_email="your.email@example.com",
-    packages=find_packages(),
+    packages=find_packages(include=["binance_mcp_server", "binance_mcp_server.*"]),
+    python_requires=">=3.10",
+    zip_safe=False,
     install_requires=[
-        "mcp",
-        "requests",
+        "mcp>=1.6.0,<2",
+        "requests>=2.28.0",
+        "urllib3>=1.26",
+        "orjson>=3.8.0",
+        "websockets>=11.0.0",
     ],
+    extras_require={
+        # Lets requests negotiate brotli- and zstd-compressed responses from Binance
+        # (zstd decoding needs urllib3 2.x)
+        "compression": ["brotli", "zstandard", "urllib3>=2.0"],
+        # Parses the all-symbols ticker response incrementally instead of all at once
+        "streaming": ["ijson"],
+        # Faster event loop for the WebSocket streams, picked up by run_server.py
+        "uvloop": ["uvloop; sys_platform != 'win32'"],
+    },
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
         "License :: OSI Approved :: MIT License",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
     ],
 ) 
\ No newline at end of file
@@ -0,0 +1,212 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from binance_mcp_server import binance_api
+
+
+class TTLCacheTest(unittest.TestCase):
+    def test_concurrent_misses_make_one_call(self):
+        calls = []
+
+        @binance_api._ttl_cache(60)
+        def fetch(symbol):
+            calls.append(symbol)
+            time.sleep(0.05)
+            return symbol.lower()
+
+        start = threading.Barrier(20)
+        results = []
+
+        def caller():
+            start.wait()
+            # Keep calling after the first fetch completes; those calls must be cache hits
+            deadline = time.monotonic() + 0.1
+            while time.monotonic() < deadline:
+                results.append(fetch("BTCUSDT"))
+
+        threads = [threading.Thread(target=caller) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(calls, ["BTCUSDT"])
+        self.assertTrue(results)
+        self.assertTrue(all(result == "btcusdt" for result in results))
+
+    def test_failed_fetch_is_not_cached(self):
+        calls = []
+
+        @binance_api._ttl_cache(60)
+        def fetch(symbol):
+            calls.append(symbol)
+            if len(calls) == 1:
+                raise RuntimeError("temporary failure")
+            return symbol
+
+        with self.assertRaises(RuntimeError):
+            fetch("BTCUSDT")
+        self.assertEqual(fetch("BTCUSDT"), "BTCUSDT")
+        self.assertEqual(len(calls), 2)
+
+    def test_entries_expire(self):
+        calls = []
+
+        @binance_api._ttl_cache(0.05)
+        def fetch(symbol):
+            calls.append(symbol)
+            return symbol
+
+        fetch("BTCUSDT")
+        fetch("BTCUSDT")
+        time.sleep(0.06)
+        fetch("BTCUSDT")
+        self.assertEqual(len(calls), 2)
+
+    def test_full_cache_evicts_oldest_entry(self):
+        calls = []
+
+        @binance_api._ttl_cache(60, maxsize=3)
+        def fetch(symbol):
+            calls.append(symbol)
+            return symbol
+
+        for symbol in ("A", "B", "C", "D"):
+            fetch(symbol)
+        # Only A made room for D; the other live entries are still cached
+        fetch("B")
+        fetch("C")
+        fetch("D")
+        self.assertEqual(calls, ["A", "B", "C", "D"])
+        fetch("A")
+        self.assertEqual(calls, ["A", "B", "C", "D", "A"])
+
+
+def _ticker(symbol, last_price):
+    return {
+        "symbol": symbol, "priceChange": "0", "priceChangePercent": "0", "weightedAvgPrice": "0",
+        "prevClosePrice": "0", "lastPrice": last_price, "lastQty": "0", "bidPrice": "0", "bidQty": "0",
+        "askPrice": "0", "askQty": "0", "openPrice": "0", "highPrice": "0", "lowPrice": "0",
+        "volume": "0", "quoteVolume": "0", "openTime": 0, "closeTime": 0, "firstId": 0,
+        "lastId": 0, "count": 0,
+    }
+
+
+def _book(symbol, bid_price):
+    return {"symbol": symbol, "bidPrice": bid_price, "bidQty": "1", "askPrice": "2", "askQty": "1"}
+
+
+class TickerCacheTest(unittest.TestCase):
+    def setUp(self):
+        binance_api.clear_cache()
+        self.addCleanup(binance_api.clear_cache)
+
+    def test_24hr_tickers_request_only_uncached_symbols(self):
+        requests_made = []
+
+        def fake_request(url, description, params=None, headers=None):
+            requests_made.append(params)
+            if "symbols" in params:
+                return [_ticker("ETHUSDT", "2"), _ticker("BNBUSDT", "3")]
+            return _ticker(params["symbol"], "1")
+
+        with mock.patch.object(binance_api, "_request", fake_request):
+            binance_api.get_24hr_ticker("BTCUSDT")
+            tickers = binance_api.get_24hr_tickers(["BTCUSDT", "ETHUSDT", "BNBUSDT"])
+            # The batch seeded the single-symbol cache
+            self.assertEqual(binance_api.get_24hr_ticker("ETHUSDT")["lastPrice"], 2.0)
+            self.assertEqual(binance_api.get_cached_24hr_ticker("BNBUSDT")["lastPrice"], 3.0)
+
+        self.assertEqual({symbol: t["lastPrice"] for symbol, t in tickers.items()},
+                         {"BTCUSDT": 1.0, "ETHUSDT": 2.0, "BNBUSDT": 3.0})
+        self.assertEqual(requests_made, [{"symbol": "BTCUSDT"}, {"symbols": '["ETHUSDT","BNBUSDT"]'}])
+
+    def test_book_tickers_fully_cached_make_no_request(self):
+        requests_made = []
+
+        def fake_request(url, description, params=None, headers=None):
+            requests_made.append(params)
+            return [_book("BTCUSDT", "1"), _book("ETHUSDT", "2")]
+
+        with mock.patch.object(binance_api, "_request", fake_request):
+            binance_api.get_book_tickers(["BTCUSDT", "ETHUSDT"])
+            books = binance_api.get_book_tickers(["ETHUSDT", "BTCUSDT"])
+            self.assertEqual(binance_api.get_book_ticker("BTCUSDT")["bidPrice"], 1.0)
+
+        self.assertEqual(len(requests_made), 1)
+        self.assertEqual(books["ETHUSDT"]["bidPrice"], 2.0)
+
+    def test_all_tickers_projection_streams_when_nothing_is_cached(self):
+        streamed = [_ticker("BTCUSDT", "1"), _ticker("ETHUSDT", "2")]
+
+        with mock.patch.object(binance_api, "ijson", object()), \
+                mock.patch.object(binance_api, "iter_24hr_ticker", return_value=iter(streamed)), \
+                mock.patch.object(binance_api, "_request", side_effect=AssertionError("full list fetched")):
+            tickers = binance_api.get_24hr_ticker(fields=["lastPrice"])
+
+        self.assertEqual(tickers, [{"symbol": "BTCUSDT", "lastPrice": 1.0}, {"symbol": "ETHUSDT", "lastPrice": 2.0}])
+
+    def test_all_tickers_projection_reuses_cached_list(self):
+        with mock.patch.object(binance_api, "_request", return_value=[_ticker("BTCUSDT", "1")]):
+            binance_api.get_24hr_ticker()
+        with mock.patch.object(binance_api, "ijson", object()), \
+                mock.patch.object(binance_api, "iter_24hr_ticker", side_effect=AssertionError("streamed")):
+            tickers = binance_api.get_24hr_ticker(fields=["lastPrice"])
+
+        self.assertEqual(tickers, [{"symbol": "BTCUSDT", "lastPrice": 1.0}])
+
+
+class PriceReaderTest(unittest.TestCase):
+    def setUp(self):
+        binance_api.clear_cache()
+        self.addCleanup(binance_api.clear_cache)
+
+    def test_missing_price_raises_runtime_error(self):
+        readers = (
+            lambda: binance_api.get_live_price("BTCUSDT"),
+            lambda: binance_api.get_average_price("BTCUSDT"),
+            binance_api.get_server_time,
+        )
+        with mock.patch.object(binance_api, "_request", return_value={"code": 0}):
+            for reader in readers:
+                with self.assertRaises(RuntimeError) as ctx:
+                    reader()
+                self.assertIn("Unexpected response", str(ctx.exception))
+
+
+class WeightThrottleTest(unittest.TestCase):
+    def setUp(self):
+        binance_api._throttle_until = 0.0
+        self.addCleanup(setattr, binance_api, "_throttle_until", 0.0)
+
+    def respond_with_weight(self, used):
+        response = mock.Mock(ok=True, content=b"{}", headers={"X-MBX-USED-WEIGHT-1M": str(used)})
+        return mock.patch.object(binance_api._SESSION, "get", return_value=response)
+
+    def test_requests_wait_for_next_minute_near_the_limit(self):
+        limit = binance_api.REQUEST_WEIGHT_LIMIT
+        with self.respond_with_weight(int(limit * 0.95)), \
+                mock.patch.object(binance_api.time, "time", return_value=120.5), \
+                mock.patch.object(binance_api.time, "sleep") as sleep:
+            binance_api._request("https://example.invalid/api/v3/time", "server time")
+            sleep.assert_not_called()
+            self.assertEqual(binance_api._throttle_until, 180)
+
+            binance_api._request("https://example.invalid/api/v3/time", "server time")
+            sleep.assert_called_once_with(59.5)
+
+    def test_requests_below_the_threshold_are_not_held_back(self):
+        limit = binance_api.REQUEST_WEIGHT_LIMIT
+        with self.respond_with_weight(int(limit * 0.5)), \
+                mock.patch.object(binance_api.time, "sleep") as sleep:
+            binance_api._request("https://example.invalid/api/v3/time", "server time")
+            binance_api._request("https://example.invalid/api/v3/time", "server time")
+
+        sleep.assert_not_called()
+        self.assertEqual(binance_api._throttle_until, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import websockets
+from websockets.exceptions import ConnectionClosed
+
+from binance_mcp_server import binance_ws_api
+
+
+class _FakeBinance:
+    """Local stand-in for Binance's combined-stream endpoint that records what clients send."""
+
+    def __init__(self):
+        self.connections = []  # Requests received, one list per accepted connection
+        self.live = []  # Server side of the currently open connections
+        self.drop_after_subscribe = 0  # Close this many connections right after a SUBSCRIBE
+        self.acknowledge = True  # Answer requests with {"result": null, "id": ...}
+
+    async def handler(self, connection):
+        requests = []
+        self.connections.append(requests)
+        self.live.append(connection)
+        try:
+            async for message in connection:
+                request = json.loads(message)
+                requests.append(request)
+                if self.acknowledge:
+                    await connection.send(json.dumps({"result": None, "id": request["id"]}))
+                if request["method"] == "SUBSCRIBE" and self.drop_after_subscribe > 0:
+                    self.drop_after_subscribe -= 1
+                    await connection.close()
+        except ConnectionClosed:
+            pass
+        finally:
+            self.live.remove(connection)
+
+    def subscribes(self, index):
+        return [request for request in self.connections[index] if request["method"] == "SUBSCRIBE"]
+
+    async def send(self, stream, data):
+        for connection in list(self.live):
+            await connection.send(json.dumps({"stream": stream, "data": data}))
+
+
+async def _wait_for(predicate, timeout=5):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+class _ManagerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.binance = _FakeBinance()
+        self.server = await websockets.serve(self.binance.handler, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        patcher = mock.patch.object(binance_ws_api, "MARKET_WS_BASE_URL", f"ws://127.0.0.1:{port}")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.reconnected = []
+
+        async def on_reconnect(connection_id):
+            self.reconnected.append(connection_id)
+
+        self.manager = binance_ws_api.BinanceWebSocketManager(max_retries=3, on_reconnect=on_reconnect)
+        self.manager.RECONNECT_MAX_DELAY = 0.01
+
+    async def asyncTearDown(self):
+        for connection_id in list(self.manager.connections):
+            await self.manager.disconnect(connection_id)
+        tasks = list(self.manager.running_tasks) + list(self.manager.dispatch_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.server.close()
+        await self.server.wait_closed()
+
+    def collector(self):
+        received = []
+
+        async def callback(message):
+            received.append(message)
+
+        return received, callback
+
+
+class ReconnectTest(_ManagerTestCase):
+    async def test_dropped_connection_is_reopened_and_subscriptions_replayed(self):
+        self.binance.drop_after_subscribe = 1
+        received, callback = self.collector()
+        results = await asyncio.gather(
+            self.manager.subscribe("btcusdt@trade", callback),
+            self.manager.subscribe("ethusdt@trade", self.collector()[1]),
+        )
+        self.assertEqual(results, [True, True])
+
+        await _wait_for(lambda: len(self.binance.connections) == 2 and self.binance.subscribes(1))
+        self.assertEqual(sorted(self.binance.subscribes(1)[0]["params"]), ["btcusdt@trade", "ethusdt@trade"])
+        await _wait_for(lambda: self.reconnected == ["combined"])
+
+        # Messages keep flowing on the new connection, and the healthy frame resets the backoff
+        await self.binance.send("btcusdt@trade", {"p": "1.0"})
+        await _wait_for(lambda: received)
+        self.assertEqual(received, [{"p": "1.0"}])
+        self.assertEqual(self.manager.reconnect_attempts, {})
+
+    async def test_gives_up_after_max_retries(self):
+        self.assertTrue(await self.manager.subscribe("btcusdt@trade", self.collector()[1]))
+        await _wait_for(lambda: self.binance.subscribes(0))
+
+        # With the server gone every reconnection attempt is refused
+        self.server.close()
+        await self.server.wait_closed()
+
+        await _wait_for(lambda: "combined" not in self.manager.connections)
+        self.assertEqual(self.manager.subscriptions, {})
+        self.assertEqual(self.reconnected, [])
+
+    async def test_disconnect_does_not_reconnect(self):
+        self.assertTrue(await self.manager.subscribe("btcusdt@trade", self.collector()[1]))
+        await _wait_for(lambda: self.binance.subscribes(0))
+
+        self.assertTrue(await self.manager.disconnect("combined"))
+        await asyncio.sleep(0.2)
+
+        self.assertEqual(len(self.binance.connections), 1)
+        self.assertNotIn("combined", self.manager.connections)
+        self.assertEqual(self.reconnected, [])
+
+
+class SubscribeBatchTest(_ManagerTestCase):
+    async def test_concurrent_subscribes_share_one_frame(self):
+        streams = ["btcusdt@trade", "ethusdt@trade", "bnbusdt@trade"]
+        results = await asyncio.gather(*(self.manager.subscribe(stream, self.collector()[1]) for stream in streams))
+        self.assertEqual(results, [True, True, True])
+
+        await _wait_for(lambda: self.binance.subscribes(0))
+        await asyncio.sleep(0.05)
+        subscribes = self.binance.subscribes(0)
+        self.assertEqual(len(subscribes), 1)
+        self.assertEqual(sorted(subscribes[0]["params"]), sorted(streams))
+
+    async def test_confirmed_subscribe_waits_for_acknowledgement(self):
+        self.assertTrue(await self.manager.subscribe("btcusdt@trade", self.collector()[1], confirm=True))
+
+    async def test_unacknowledged_confirmed_subscribe_fails(self):
+        self.binance.acknowledge = False
+        self.manager.REQUEST_TIMEOUT = 0.1
+        self.assertFalse(await self.manager.subscribe("btcusdt@trade", self.collector()[1], confirm=True))
+        self.assertEqual(self.manager.pending_requests, {})
+
+    async def test_cancelled_batch_resolves_false(self):
+        self.manager.SUBSCRIBE_BATCH_WINDOW = 10
+        subscribe = asyncio.ensure_future(self.manager.subscribe("btcusdt@trade", self.collector()[1]))
+        await _wait_for(lambda: "combined" in self.manager.subscribe_batches)
+
+        # What cleanup() does on shutdown
+        tasks = list(self.manager.running_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self.assertFalse(await asyncio.wait_for(subscribe, timeout=1))
+        self.assertEqual(self.manager.subscribe_batches, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from binance_mcp_server import binance_api
+from binance_mcp_server.commands.market_data import _SymbolCoalescer, register_market_data_commands
+
+
+class _ToolRecorder:
+    """Stands in for FastMCP, keeping the registered tool functions by name."""
+
+    def __init__(self):
+        self.tools = {}
+
+    def tool(self):
+        def register(func):
+            self.tools[func.__name__] = func
+            return func
+        return register
+
+
+class SymbolCoalescerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_batch_network_error_falls_back_to_single_requests(self):
+        def fetch_many(symbols):
+            raise ConnectionError("connection reset")
+
+        coalescer = _SymbolCoalescer(lambda symbol: f"{symbol}-one", fetch_many, window=0.01)
+        results = await asyncio.wait_for(
+            asyncio.gather(*(coalescer.get(symbol) for symbol in ("A", "B", "C"))), timeout=2
+        )
+        self.assertEqual(results, ["A-one", "B-one", "C-one"])
+
+    async def test_batch_results_are_shared(self):
+        coalescer = _SymbolCoalescer(
+            lambda symbol: self.fail("batch should be used"),
+            lambda symbols: {symbol: symbol.lower() for symbol in symbols},
+            window=0.01,
+        )
+        results = await asyncio.wait_for(
+            asyncio.gather(*(coalescer.get(symbol) for symbol in ("A", "B", "C"))), timeout=2
+        )
+        self.assertEqual(results, ["a", "b", "c"])
+
+    async def test_unexpected_batch_result_reaches_callers(self):
+        coalescer = _SymbolCoalescer(lambda symbol: symbol, lambda symbols: 42, window=0.01)
+        results = await asyncio.wait_for(
+            asyncio.gather(*(coalescer.get(symbol) for symbol in ("A", "B", "C")), return_exceptions=True),
+            timeout=2,
+        )
+        self.assertTrue(all(isinstance(result, TypeError) for result in results))
+
+    async def test_cached_symbols_skip_the_batch_window(self):
+        coalescer = _SymbolCoalescer(
+            lambda symbol: self.fail("cached symbol should not be fetched"),
+            lambda symbols: self.fail("cached symbol should not be batched"),
+            cached=lambda symbol: f"{symbol}-cached",
+            window=10,
+        )
+        self.assertEqual(await asyncio.wait_for(coalescer.get("A"), timeout=1), "A-cached")
+        self.assertIsNone(coalescer._pending)
+
+    async def test_cancelled_flush_fails_waiting_callers(self):
+        coalescer = _SymbolCoalescer(lambda symbol: symbol, lambda symbols: {}, window=10)
+        waiter = asyncio.ensure_future(coalescer.get("A"))
+        await asyncio.sleep(0)
+        coalescer._flush_task.cancel()
+        with self.assertRaises(RuntimeError):
+            await asyncio.wait_for(waiter, timeout=2)
+        self.assertIsNone(coalescer._pending)
+
+
+class OrderBooksToolTest(unittest.IsolatedAsyncioTestCase):
+    async def test_duplicates_fetched_once_and_errors_reported_per_symbol(self):
+        calls = []
+
+        def get_order_book(symbol, limit=100):
+            calls.append(symbol)
+            if symbol == "BAD":
+                raise binance_api.BinanceAPIError("order book", 400, '{"code":-1121,"msg":"Invalid symbol."}')
+            return {"bids": [], "asks": [], "symbol": symbol}
+
+        recorder = _ToolRecorder()
+        register_market_data_commands(recorder)
+        with mock.patch.object(binance_api, "get_order_book", get_order_book):
+            books = await recorder.tools["get_order_books"](["BTCUSDT", "BAD", "BTCUSDT"], depth=5)
+
+        self.assertEqual(sorted(calls), ["BAD", "BTCUSDT"])
+        self.assertEqual(list(books), ["BTCUSDT", "BAD"])
+        self.assertEqual(books["BTCUSDT"]["symbol"], "BTCUSDT")
+        self.assertIn("Invalid symbol", books["BAD"]["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()